@@ -4,6 +4,7 @@ The custom component for local network access to Midea appliances
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -25,13 +26,18 @@ from homeassistant.const import (
     CONF_USERNAME,
 )
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity_registry import async_get
+from homeassistant.helpers.entity_registry import (
+    async_entries_for_config_entry,
+    async_get,
+)
 from midea_beautiful.cloud import MideaCloud
 from midea_beautiful.exceptions import MideaError
 from midea_beautiful.lan import LanDevice
 from midea_beautiful.midea import SUPPORTED_APPS, DEFAULT_APP_ID, DEFAULT_APPKEY
 
 from custom_components.midea_dehumidifier_lan.const import (
+    APPLIANCE_CALL_TIMEOUT,
+    APPLIANCE_REFRESH_CONCURRENCY,
     CONF_MOBILE_APP,
     CONF_TOKEN_KEY,
     CONF_USE_CLOUD_OBSOLETE,
@@ -40,8 +46,8 @@ from custom_components.midea_dehumidifier_lan.const import (
     DISCOVERY_CLOUD,
     DISCOVERY_IGNORE,
     DISCOVERY_LAN,
+    DISCOVERY_MODES,
     DISCOVERY_WAIT,
-    DOMAIN,
     LOCAL_BROADCAST,
     NAME,
     CURRENT_CONFIG_VERSION,
@@ -50,20 +56,43 @@ from custom_components.midea_dehumidifier_lan.const import (
     PLATFORMS,
     UNKNOWN_IP,
 )
-from custom_components.midea_dehumidifier_lan.hub import Hub
-from custom_components.midea_dehumidifier_lan.util import MideaClient, address_ok
+from custom_components.midea_dehumidifier_lan.hub import Hub, MideaConfigEntry
+from custom_components.midea_dehumidifier_lan.util import (
+    MideaClient,
+    RedactedConf,
+    address_ok,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Device configuration keys kept by migration, with their default values
+_DEVICE_DEFAULTS: dict[str, Any] = {
+    CONF_API_VERSION: None,
+    CONF_DISCOVERY: None,
+    CONF_ID: None,
+    CONF_IP_ADDRESS: UNKNOWN_IP,
+    CONF_NAME: None,
+    CONF_TOKEN: None,
+    CONF_TOKEN_KEY: None,
+    CONF_TYPE: None,
+    CONF_UNIQUE_ID: None,
+    CONF_TTL: DEFAULT_TTL,
+}
 
-async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
-    """Set up platform from a ConfigEntry."""
-    hass.data.setdefault(DOMAIN, {})
 
-    if (hub := hass.data[DOMAIN].get(config_entry.entry_id)) is None:
-        hub = Hub(hass, config_entry)
-        hass.data[DOMAIN][config_entry.entry_id] = hub
-    await hub.async_setup()
+async def async_setup_entry(
+    hass: HomeAssistant, config_entry: MideaConfigEntry
+) -> bool:
+    """Set up platform from a ConfigEntry."""
+    # runtime_data outlives unload, so each setup starts with a new hub
+    hub = Hub(hass, config_entry)
+    try:
+        await hub.async_setup()
+    except Exception:
+        # Stop worker threads and timers of the failed attempt
+        await hub.async_unload()
+        raise
+    config_entry.runtime_data = hub
     await _async_migrate_names(hass, config_entry)
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
@@ -75,136 +104,121 @@ async def _async_migrate_names(hass: HomeAssistant, config_entry: ConfigEntry) -
 
     conf = config_entry.data
     if devices := conf.get(CONF_DEVICES):
-        old_entites = [
-            entry
-            for _, entry in entity_registry.entities.items()
-            if entry.platform == DOMAIN
-        ]
-        for reg_entry in old_entites:
-            for device in devices:
-                old_suffix = f"_{device[CONF_ID]}"
-                new_suffix = f"_{device[CONF_UNIQUE_ID]}"
-                if reg_entry.unique_id.endswith(old_suffix):
-                    prefix = reg_entry.unique_id[: -len(old_suffix)]
-                    old_unique_id = reg_entry.unique_id
-                    new_unique_id = f"{prefix}{new_suffix}"
-                    try:
-                        entity_registry.async_update_entity(
-                            reg_entry.entity_id,
-                            new_unique_id=new_unique_id,
-                        )
-                        _LOGGER.warning(
-                            "Changed unique id of %s from %s to %s",
-                            reg_entry.entity_id,
-                            old_unique_id,
-                            new_unique_id,
-                        )
-                    except ValueError as ex:
-                        _LOGGER.error(
-                            "Unable to change unique id of %s: %s",
-                            reg_entry.entity_id,
-                            ex,
-                        )
-
-
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+        # Old unique ids end with appliance id, new ones with serial number
+        new_suffixes = {
+            str(device[CONF_ID]): f"_{device[CONF_UNIQUE_ID]}" for device in devices
+        }
+        # Only entities of this entry can have old unique ids
+        entries = async_entries_for_config_entry(entity_registry, config_entry.entry_id)
+        renames: dict[str, str] = {}
+        for reg_entry in entries:
+            prefix, sep, appliance_id = reg_entry.unique_id.rpartition("_")
+            if not sep or (new_suffix := new_suffixes.get(appliance_id)) is None:
+                continue
+            new_unique_id = f"{prefix}{new_suffix}"
+            if new_unique_id != reg_entry.unique_id:
+                renames[reg_entry.entity_id] = new_unique_id
+
+        renamed = 0
+        for entity_id, new_unique_id in renames.items():
+            try:
+                entity_registry.async_update_entity(
+                    entity_id,
+                    new_unique_id=new_unique_id,
+                )
+                renamed += 1
+                _LOGGER.debug("Changed unique id of %s to %s", entity_id, new_unique_id)
+            except ValueError as ex:
+                _LOGGER.error(
+                    "Unable to change unique id of %s: %s",
+                    entity_id,
+                    ex,
+                )
+        if renamed:
+            _LOGGER.warning("Changed unique ids of %d entities", renamed)
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: MideaConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hub: Hub = hass.data[DOMAIN].pop(entry.entry_id)
-        await hub.async_unload()
+        await entry.runtime_data.async_unload()
 
     return unload_ok
 
 
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Migrate old config entry to new version."""
-    _LOGGER.debug("Migrating from version %s", config_entry.version)
+    if config_entry.version >= CURRENT_CONFIG_VERSION:
+        return True
 
-    if config_entry.version < CURRENT_CONFIG_VERSION:
-        old_conf = config_entry.data
-        old_broadcast = old_conf.get(CONF_BROADCAST_ADDRESS, [])
-        if not old_broadcast:
-            old_broadcast = [LOCAL_BROADCAST]
-        new_conf = {
-            CONF_MOBILE_APP: old_conf.get(CONF_MOBILE_APP),
-            CONF_BROADCAST_ADDRESS: old_broadcast,
-            CONF_USERNAME: old_conf.get(CONF_USERNAME),
-            CONF_PASSWORD: old_conf.get(CONF_PASSWORD),
-        }
-        if not old_conf.get(OBSOLETE_CONF_APPID) or not old_conf.get(
-            OBSOLETE_CONF_APPKEY
-        ):
-            new_conf[CONF_MOBILE_APP] = DEFAULT_APP
+    _LOGGER.debug("Migrating from version %s", config_entry.version)
+    old_conf = config_entry.data
+    old_broadcast = old_conf.get(CONF_BROADCAST_ADDRESS, [])
+    if not old_broadcast:
+        old_broadcast = [LOCAL_BROADCAST]
+    new_conf = {
+        CONF_MOBILE_APP: old_conf.get(CONF_MOBILE_APP),
+        CONF_BROADCAST_ADDRESS: old_broadcast,
+        CONF_USERNAME: old_conf.get(CONF_USERNAME),
+        CONF_PASSWORD: old_conf.get(CONF_PASSWORD),
+    }
+    if not old_conf.get(OBSOLETE_CONF_APPID) or not old_conf.get(OBSOLETE_CONF_APPKEY):
+        new_conf[CONF_MOBILE_APP] = DEFAULT_APP
+    else:
+        appkey = old_conf.get(OBSOLETE_CONF_APPKEY, DEFAULT_APPKEY)
+        if appkey:
+            for appname, appconf in SUPPORTED_APPS.items():
+                if appconf["appkey"] == appkey:
+                    new_conf[CONF_MOBILE_APP] = appname
+                    break
         else:
-            appkey = old_conf.get(OBSOLETE_CONF_APPKEY, DEFAULT_APPKEY)
-            if appkey:
-                for appname, appconf in SUPPORTED_APPS.items():
-                    if appconf["appkey"] == appkey:
-                        new_conf[CONF_MOBILE_APP] = appname
-                        break
-            else:
-                appid = old_conf.get(OBSOLETE_CONF_APPID, DEFAULT_APP_ID)
-                for appname, appconf in SUPPORTED_APPS.items():
-                    if appconf["appid"] == appid:
-                        new_conf[CONF_MOBILE_APP] = appname
-                        break
-
-        new_devices = []
-        new_conf[CONF_DEVICES] = new_devices
-
-        id_resolver = _ApplianceIdResolver(hass)
-
-        old: dict[str, Any]
-        for old in config_entry.data[CONF_DEVICES]:
-            new = {
-                CONF_API_VERSION: old.get(CONF_API_VERSION),
-                CONF_DISCOVERY: old.get(CONF_DISCOVERY),
-                CONF_ID: old.get(CONF_ID),
-                CONF_IP_ADDRESS: old.get(CONF_IP_ADDRESS, UNKNOWN_IP),
-                CONF_NAME: old.get(CONF_NAME),
-                CONF_TOKEN: old.get(CONF_TOKEN),
-                CONF_TOKEN_KEY: old.get(CONF_TOKEN_KEY),
-                CONF_TYPE: old.get(CONF_TYPE),
-                CONF_UNIQUE_ID: old.get(CONF_UNIQUE_ID),
-                CONF_TTL: old.get(CONF_TTL, DEFAULT_TTL),
-            }
-
-            discovery_mode = new.get(CONF_DISCOVERY)
-            if discovery_mode not in [
-                DISCOVERY_WAIT,
-                DISCOVERY_LAN,
-                DISCOVERY_IGNORE,
-                DISCOVERY_CLOUD,
-            ]:
-                if old.get(CONF_USE_CLOUD_OBSOLETE):
-                    new[CONF_DISCOVERY] = DISCOVERY_CLOUD
-                elif old.get(CONF_EXCLUDE):
-                    new[CONF_DISCOVERY] = DISCOVERY_IGNORE
-                elif not address_ok(old.get(CONF_IP_ADDRESS)):
-                    new[CONF_DISCOVERY] = DISCOVERY_WAIT
-                else:
-                    new[CONF_DISCOVERY] = DISCOVERY_LAN
+            appid = old_conf.get(OBSOLETE_CONF_APPID, DEFAULT_APP_ID)
+            for appname, appconf in SUPPORTED_APPS.items():
+                if appconf["appid"] == appid:
+                    new_conf[CONF_MOBILE_APP] = appname
+                    break
 
-            await id_resolver.async_get_unique_id_if_missing(new_conf, new)
-            new_devices.append(new)
+    new_devices = [_migrated_device(old) for old in old_conf[CONF_DEVICES]]
+    new_conf[CONF_DEVICES] = new_devices
 
-        config_entry.version = CURRENT_CONFIG_VERSION
+    id_resolver = _ApplianceIdResolver(hass)
+    await id_resolver.async_get_unique_ids_if_missing(new_conf, new_devices)
+
+    _LOGGER.debug(
+        "Migrating configuration from %s to %s",
+        RedactedConf(config_entry.data),
+        RedactedConf(new_conf),
+    )
+    if hass.config_entries.async_update_entry(
+        config_entry, data=new_conf, title=NAME, version=CURRENT_CONFIG_VERSION
+    ):
+        _LOGGER.info("Configuration migrated to version %s", config_entry.version)
+    else:
         _LOGGER.debug(
-            "Migrating configuration from %s to %s", config_entry.data, new_conf
+            "Configuration didn't change during migration to version %s",
+            config_entry.version,
         )
-        if hass.config_entries.async_update_entry(
-            config_entry, data=new_conf, title=NAME
-        ):
-            _LOGGER.info("Configuration migrated to version %s", config_entry.version)
-        else:
-            _LOGGER.debug(
-                "Configuration didn't change during migration to version %s",
-                config_entry.version,
-            )
-        return id_resolver.success
+    return id_resolver.success
+
+
+def _migrated_device(old: dict[str, Any]) -> dict[str, Any]:
+    """Builds device configuration from obsolete one"""
+    new = {key: old.get(key, default) for key, default in _DEVICE_DEFAULTS.items()}
+    if new[CONF_DISCOVERY] not in DISCOVERY_MODES:
+        new[CONF_DISCOVERY] = _migrated_discovery_mode(old)
+    return new
 
-    return True
+
+def _migrated_discovery_mode(old: dict[str, Any]) -> str:
+    """Deduces discovery mode from obsolete device configuration"""
+    if old.get(CONF_USE_CLOUD_OBSOLETE):
+        return DISCOVERY_CLOUD
+    if old.get(CONF_EXCLUDE):
+        return DISCOVERY_IGNORE
+    if not address_ok(old.get(CONF_IP_ADDRESS)):
+        return DISCOVERY_WAIT
+    return DISCOVERY_LAN
 
 
 # pylint: disable=too-few-public-methods
@@ -213,30 +227,43 @@ class _ApplianceIdResolver:
         self.hass = hass
         self.client = MideaClient(hass)
         self.cloud: MideaCloud | None = None
-        self.descriptors: list[dict] | None = None
+        # Cloud appliance descriptors indexed by appliance id
+        self.descriptors: dict[str, dict] | None = None
         self.success = True
+        # Probes run on shared executor, so only few of them run at once
+        self._probe_semaphore = asyncio.Semaphore(APPLIANCE_REFRESH_CONCURRENCY)
 
     async def _start(self, conf: dict[str, Any]) -> None:
         try:
-            self.cloud = await self.client.async_connect_to_cloud(conf)
-            self.descriptors = await self.client.async_list_appliances(self.cloud)
-        except MideaError as ex:
+            async with asyncio.timeout(APPLIANCE_CALL_TIMEOUT):
+                self.cloud = await self.client.async_connect_to_cloud(conf)
+                appliances = await self.client.async_list_appliances(self.cloud)
+            self.descriptors = {app["id"]: app for app in appliances}
+        except (MideaError, TimeoutError) as ex:
             _LOGGER.error(
                 "Unable to get list of appliances during configuration migration %s.",
                 ex,
                 exc_info=True,
             )
 
-    async def async_get_unique_id_if_missing(
+    async def async_get_unique_ids_if_missing(
         self,
         conf: dict[str, Any],
-        device_conf: dict[str, Any],
+        devices: list[dict[str, Any]],
     ) -> None:
-        """If there is no unique_id assigned, try to find serial number"""
-        if device_conf[CONF_UNIQUE_ID] is None:
-            if device_conf[CONF_DISCOVERY] == DISCOVERY_LAN:
-                appliance = await self._get_appliance_state(device_conf)
-                device_conf[CONF_UNIQUE_ID] = appliance and appliance.serial_number
+        """For devices without unique_id assigned, try to find serial number.
+        Appliances on local network are polled concurrently, up to
+        APPLIANCE_REFRESH_CONCURRENCY at a time."""
+        missing = [device for device in devices if device[CONF_UNIQUE_ID] is None]
+        lan_devices = [
+            device for device in missing if device[CONF_DISCOVERY] == DISCOVERY_LAN
+        ]
+        appliances = await asyncio.gather(
+            *(self._get_appliance_state(device) for device in lan_devices)
+        )
+        for device_conf, appliance in zip(lan_devices, appliances):
+            device_conf[CONF_UNIQUE_ID] = appliance and appliance.serial_number
+        for device_conf in missing:
             if device_conf[CONF_UNIQUE_ID] is None:
                 if self.cloud is None:
                     await self._start(conf)
@@ -252,13 +279,11 @@ class _ApplianceIdResolver:
 
     def _find_unique_id_in_appliance_list(self, device_conf) -> None:
         if self.descriptors is not None:
-            for app in self.descriptors:
-                if app["id"] == device_conf[CONF_ID]:
-                    if app["sn"] and app["sn"] != "Unknown":
-                        device_conf[CONF_UNIQUE_ID] = app["sn"]
-                    else:
-                        _LOGGER.warning("Unable to get serial number for %s", app)
-                    break
+            if app := self.descriptors.get(device_conf[CONF_ID]):
+                if app["sn"] and app["sn"] != "Unknown":
+                    device_conf[CONF_UNIQUE_ID] = app["sn"]
+                else:
+                    _LOGGER.warning("Unable to get serial number for %s", app)
 
     async def _get_appliance_state(
         self,
@@ -267,16 +292,18 @@ class _ApplianceIdResolver:
         use_cloud: bool = False,
     ) -> LanDevice | None:
         try:
-            return await self.hass.async_add_executor_job(
-                self.client.appliance_state,
-                device_conf[CONF_IP_ADDRESS],
-                device_conf[CONF_TOKEN],
-                device_conf[CONF_TOKEN_KEY],
-                cloud,
-                use_cloud,
-                device_conf[CONF_ID],
-            )
-        except MideaError as ex:
+            # Waiting for a free slot doesn't count towards timeout
+            async with self._probe_semaphore, asyncio.timeout(APPLIANCE_CALL_TIMEOUT):
+                return await self.hass.async_add_executor_job(
+                    self.client.appliance_state,
+                    device_conf[CONF_IP_ADDRESS],
+                    device_conf[CONF_TOKEN],
+                    device_conf[CONF_TOKEN_KEY],
+                    cloud,
+                    use_cloud,
+                    device_conf[CONF_ID],
+                )
+        except (MideaError, TimeoutError) as ex:
             _LOGGER.error(
                 "Unable to poll appliance during configuration migration %s.",
                 ex,
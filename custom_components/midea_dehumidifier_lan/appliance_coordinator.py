@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
+import random
 from time import monotonic
-from typing import Any, cast, final
+from typing import Any, final
 
 from homeassistant.const import CONF_DISCOVERY, CONF_TOKEN, CONF_TTL
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import (
@@ -20,10 +22,11 @@ from homeassistant.helpers.update_coordinator import (
 from homeassistant.util import slugify
 from midea_beautiful.appliance import AirConditionerAppliance, DehumidifierAppliance
 from midea_beautiful.cloud import MideaCloud
-from midea_beautiful.exceptions import MideaError
+from midea_beautiful.exceptions import CloudAuthenticationError, MideaError
 from midea_beautiful.lan import LanDevice
 
 from custom_components.midea_dehumidifier_lan.const import (
+    APPLIANCE_MAX_BACKOFF,
     APPLIANCE_REFRESH_COOLDOWN,
     APPLIANCE_REFRESH_INTERVAL,
     CONF_TOKEN_KEY,
@@ -61,7 +64,8 @@ class ApplianceUpdateCoordinator(DataUpdateCoordinator, ApplianceCoordinator):
             _LOGGER,
             name=appliance.name,
             update_method=self._async_appliance_refresh,
-            update_interval=timedelta(seconds=APPLIANCE_REFRESH_INTERVAL),
+            # Periodic refresh is driven by the hub for all appliances
+            update_interval=None,
             request_refresh_debouncer=Debouncer(
                 hass,
                 _LOGGER,
@@ -73,63 +77,132 @@ class ApplianceUpdateCoordinator(DataUpdateCoordinator, ApplianceCoordinator):
         self.hub = hub
         self.appliance = appliance
         self.updating = {}
-        self.wait_for_update = False
+        self._poll_lock = asyncio.Lock()
         self.device = device
         self.discovery_mode = device.get(CONF_DISCOVERY, DISCOVERY_IGNORE)
         self.use_cloud: bool = self.discovery_mode == DISCOVERY_CLOUD
+        self._bound_cloud: MideaCloud | None = None
+        self._bind_cloud()
         self.available = available
         # TTL is in minutes
         self.time_to_leave = 60 * int(device.get(CONF_TTL, DEFAULT_TTL))
         self.has_failure = False
         self.first_failure_time: float = 0
+        self.failure_count = 0
+        self.next_attempt_time: float = 0
+        # Cause of failure reported to coordinator, None while data is valid
+        self.last_error: str | None = None
+        # Appliance type doesn't change, so it is classified only once
+        self.is_dehumidifier_device = DehumidifierAppliance.supported(appliance.type)
+        self.is_climate_device = AirConditionerAppliance.supported(appliance.type)
+
+    def is_climate(self) -> bool:
+        return self.is_climate_device
+
+    def is_dehumidifier(self) -> bool:
+        return self.is_dehumidifier_device
 
     def _cloud(self) -> MideaCloud | None:
-        if self.use_cloud:
-            if not self.hub.cloud:
-                raise UpdateFailed(
-                    f"Midea cloud API was not initialized, {self.appliance}"
-                    f" configuration={RedactedConf(self.hub.config)}"
-                )
-            return self.hub.cloud
-        return None
+        if self.use_cloud and not self._bound_cloud:
+            raise UpdateFailed(
+                f"Midea cloud API was not initialized, {self.appliance}"
+                f" configuration={RedactedConf(self.hub.config)}"
+            )
+        return self._bound_cloud
+
+    def _bind_cloud(self) -> None:
+        """Binds hub's cloud session if appliance is polled via cloud.
+        Hub connects to cloud while discovering appliance, so binding is
+        done when coordinator is created and after appliance is detected."""
+        self._bound_cloud = self.hub.cloud if self.use_cloud else None
 
     async def _async_appliance_refresh(self) -> LanDevice:
         """Called to refresh appliance state"""
 
-        if not self.available:
-            await self._async_try_to_detect()
-
-        if self.wait_for_update:
+        # Pending changes wait for running poll, so they are not left
+        # for the next one. Plain refresh is just skipped.
+        if self._poll_lock.locked() and not self.updating:
+            _LOGGER.debug("Skipping refresh of %s, previous still running", self.name)
+            return self.appliance
+        async with self._poll_lock:
+            return await self._async_poll_appliance()
+
+    async def _async_poll_appliance(self) -> LanDevice:
+        # Back off from unresponsive appliance, unless there are changes to apply
+        if not self.updating and monotonic() < self.next_attempt_time:
+            if self.last_error is not None:
+                # Skipped poll must not report failed appliance as recovered
+                raise UpdateFailed(self.last_error)
             return self.appliance
 
-        try:
-            if self.updating:
-                await self._async_do_update()
+        if not self.available:
+            try:
+                await self._async_try_to_detect()
+            except UpdateFailed as ex:
+                self._back_off()
+                self.last_error = str(ex)
+                raise
 
-            await self.hass.async_add_executor_job(
-                self.appliance.refresh, self._cloud()
-            )
+        try:
+            # Waiting for a free slot doesn't count towards timeout
+            async with self.hub.refresh_semaphore:
+                if self.updating:
+                    await self._async_do_update()
+                else:
+                    await self.hub.async_add_appliance_job(
+                        self.appliance.refresh, self._cloud()
+                    )
             self.has_failure = False
-        except MideaError as ex:
+            self.failure_count = 0
+            self.next_attempt_time = 0
+            self.last_error = None
+        except (MideaError, TimeoutError) as ex:
+            cause = str(ex) or "request timed out"
+            if self.use_cloud and isinstance(ex, CloudAuthenticationError):
+                # Session is no longer valid, retrying with it can't succeed.
+                # Reauthentication reloads entry, which logs in again.
+                self._bound_cloud = None
+                self.hub.forget_cloud()
+                raise ConfigEntryAuthFailed(cause) from ex
             if not self.has_failure:
                 self.has_failure = True
                 self.first_failure_time = monotonic()
+            self._back_off()
             if (monotonic() - self.first_failure_time) >= self.time_to_leave:
-                raise UpdateFailed(str(ex)) from ex
+                self.last_error = cause
+                raise UpdateFailed(cause) from ex
             _LOGGER.warning(
-                "Error fetching %s data: %s, will be trying again.", self.name, ex
+                "Error fetching %s data: %s, will be trying again.", self.name, cause
             )
-        finally:
-            self.wait_for_update = False
         return self.appliance
 
+    def _back_off(self) -> None:
+        """Delays next poll of failing appliance.
+        Delay is measured in refresh intervals, as appliance is only polled
+        by hub's refresh cycle. It doubles with each failure, up to
+        APPLIANCE_MAX_BACKOFF."""
+        self.failure_count += 1
+        backoff = min(
+            APPLIANCE_MAX_BACKOFF,
+            APPLIANCE_REFRESH_INTERVAL * 2 ** (self.failure_count - 1),
+        )
+        # Jitter keeps appliances that failed together from retrying together
+        self.next_attempt_time = monotonic() + random.uniform(backoff / 2, backoff)
+
     async def _async_do_update(self):
-        self.wait_for_update = True
-        _LOGGER.debug("Updating attributes for %s: %s", self.appliance, self.updating)
-        for attr in self.updating:
-            setattr(self.appliance.state, attr, self.updating[attr])
-        self.updating.clear()
-        await self.hass.async_add_executor_job(self.appliance.apply, self._cloud())
+        # Swap is atomic in event loop, changes requested from now on
+        # are sent with the next update
+        pending, self.updating = self.updating, {}
+        _LOGGER.debug("Updating attributes for %s: %s", self.appliance, pending)
+        for attr, value in pending.items():
+            setattr(self.appliance.state, attr, value)
+        await self.hub.async_add_appliance_job(self._apply_and_refresh, self._cloud())
+
+    def _apply_and_refresh(self, cloud: MideaCloud | None) -> None:
+        """Sends changes to appliance and reads back its state in a single
+        executor job"""
+        self.appliance.apply(cloud)
+        self.appliance.refresh(cloud)
 
     async def _async_try_to_detect(self):
         _LOGGER.debug("Trying to find appliance %s", self.appliance)
@@ -141,14 +214,19 @@ class ApplianceUpdateCoordinator(DataUpdateCoordinator, ApplianceCoordinator):
             self.device[CONF_TOKEN_KEY] = appliance.key
 
         self.appliance = appliance
+        self._bind_cloud()
         await self.hub.async_update_config()
         self.available = True
 
     async def async_apply(self, args: dict) -> None:
-        """Applies changes to device"""
-        for key, value in args.items():
-            self.updating[key] = value
-        await self.async_request_refresh()
+        """Applies changes to device.
+        Changes requested during the same event loop iteration are sent to
+        appliance together."""
+        self.updating.update(args)
+        # Let other pending changes join before sending them
+        await asyncio.sleep(0)
+        if self.updating:
+            await self.async_request_refresh()
 
 
 class ApplianceEntity(CoordinatorEntity):
@@ -167,6 +245,7 @@ class ApplianceEntity(CoordinatorEntity):
         super().__init__(coordinator)
         self._attr_unique_id = f"{self.unique_id_prefix}{self.appliance.serial_number}"
         self._attr_name = str(self.appliance.name or self.unique_id) + self.name_suffix
+        self._attr_device_info = self._build_device_info()
         if self._add_extra_attrs:
             self._attr_extra_state_attributes = {
                 "last_error_code": 0,
@@ -185,7 +264,9 @@ class ApplianceEntity(CoordinatorEntity):
     def _updated_data(self) -> None:
         """Called when data has been updated by coordinator"""
 
-        self.appliance = self.coordinator.appliance
+        if self.appliance is not self.coordinator.appliance:
+            self.appliance = self.coordinator.appliance
+            self._attr_device_info = self._build_device_info()
         self._attr_available = self.appliance.online
         if not self.coordinator.available:
             self.on_online(False)
@@ -240,12 +321,12 @@ class ApplianceEntity(CoordinatorEntity):
     @final
     def dehumidifier(self) -> DehumidifierAppliance:
         """Returns state as dehumidifier"""
-        return cast(DehumidifierAppliance, self.appliance.state)
+        return self.appliance.state  # type: ignore[return-value]
 
     @final
     def airconditioner(self) -> AirConditionerAppliance:
         """Returns state as air conditioner"""
-        return cast(AirConditionerAppliance, self.appliance.state)
+        return self.appliance.state  # type: ignore[return-value]
 
     @property
     def available(self) -> bool:
@@ -268,27 +349,19 @@ class ApplianceEntity(CoordinatorEntity):
         slug = slugify(strip)
         return f"{self._unique_id_prefx}{slug}_"
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        identifier = str(self.appliance.serial_number or self.appliance.serial_number)
-        mac = self.appliance.mac
+    def _build_device_info(self) -> DeviceInfo:
+        """Device information, rebuilt only when appliance changes"""
         return DeviceInfo(
-            identifiers={(DOMAIN, str(identifier))},
+            identifiers={(DOMAIN, str(self.appliance.serial_number))},
             name=self.appliance.name,
             manufacturer="Midea",
             model=str(self.appliance.model),
             sw_version=self.appliance.firmware_version,
         )
 
-    def apply(self, *args, **kwargs) -> None:
+    async def async_apply(self, *args, **kwargs) -> None:
         """Applies changes to device"""
         if len(args) % 2 != 0:
             raise ValueError(f"Expecting attribute/value pairs, had {len(args)} items")
-        aargs = {}
-        for i in range(0, len(args), 2):
-            aargs[args[i]] = args[i + 1]
-        for key, value in kwargs.items():
-            aargs[key] = value
-        asyncio.run_coroutine_threadsafe(
-            self.coordinator.async_apply(aargs), self.hass.loop
-        ).result()
+        aargs = dict(zip(args[0::2], args[1::2])) | kwargs
+        await self.coordinator.async_apply(aargs)
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import ipaddress
-from itertools import chain, cycle
+from itertools import chain, islice
 import logging
 from typing import Any, Iterator, cast
 
 from homeassistant.core import CALLBACK_TYPE
+from homeassistant.components import persistent_notification
 from homeassistant.components.network import async_get_ipv4_broadcast_addresses
 from homeassistant.const import (
     CONF_API_VERSION,
@@ -53,11 +55,6 @@ from custom_components.midea_dehumidifier_lan.util import (
 _LOGGER = logging.getLogger(__name__)
 
 
-def empty_address_iterator():
-    """No addresses to iterate"""
-    yield from ()
-
-
 def _add_if_discoverable(conf_addresses: list[str], device: dict[str, Any]):
     if device.get(CONF_DISCOVERY) != DISCOVERY_LAN:
         if address_ok(device[CONF_IP_ADDRESS]):
@@ -82,29 +79,54 @@ class ApplianceDiscoveryHelper:  # pylint: disable=too-many-instance-attributes
         self.new_devices: list[LanDevice] = []
         self.changed_devices: list[_ChangedDevice] = []
         self.broadcast_addresses: list[str] = []
-        self.address_iterator: Iterator[list[str]] = empty_address_iterator()
+        self.address_iterator: Iterator[list[str]] = iter(())
         self.notifed_addresses: set[str] = set()
         self.remove_discovery: CALLBACK_TYPE | None = None
         self.conf_addresses: list[str] = []
+        self._discovery_lock = asyncio.Lock()
 
     def _admit_new(self) -> bool:
         """Admits new devices into configurations"""
         need_reload = False
         added_devices: list[dict[str, Any]] = []
         dev_confs = self.hub.config[CONF_DEVICES]
+        known_by_sn = {known[CONF_UNIQUE_ID]: known for known in dev_confs}
         for new in self.new_devices:
-            for known in dev_confs:
+            if (known := known_by_sn.get(new.serial_number)) is not None:
                 if self._admitted_known_device(known, new):
                     need_reload = True
-                break
             else:
                 added_devices.append(self._admit_not_known_device(new))
                 need_reload = True
 
         if added_devices:
+            self._unknown_devices_notification(added_devices)
             dev_confs += added_devices
         return need_reload
 
+    def _unknown_devices_notification(self, added: list[dict[str, Any]]) -> None:
+        """Single notification for all unknown devices found in one discovery"""
+        if len(added) == 1:
+            msg = (
+                f"Found previously unknown device {added[0][CONF_NAME]}"
+                f" found on {added[0][CONF_IP_ADDRESS]}."
+            )
+        else:
+            found = "".join(
+                f"\n- {device[CONF_NAME]} on {device[CONF_IP_ADDRESS]}"
+                for device in added
+            )
+            msg = f"Found {len(added)} previously unknown devices:{found}\n"
+        # Each batch gets its own notification, so earlier ones stay visible
+        serial_numbers = sorted(str(device[CONF_UNIQUE_ID]) for device in added)
+        notification_id = f"midea_unknown_{'_'.join(serial_numbers)}"
+        persistent_notification.async_create(
+            self.hass,
+            f"{msg} [Check it out.](/config/integrations)",
+            title=NAME,
+            notification_id=notification_id,
+        )
+
     def _admit_not_known_device(self, new: LanDevice) -> dict[str, Any]:
         name = f"{new.model} {new.mac[-4] if new.mac else new.serial_number}"
         new_device = {
@@ -120,56 +142,47 @@ class ApplianceDiscoveryHelper:  # pylint: disable=too-many-instance-attributes
         }
 
         _LOGGER.debug("Found unknown device %s at %s.", name, new.address)
-        msg = (
-            f"Found previously unknown device {name} found on {new.address}."
-            f" [Check it out.](/config/integrations)"
-        )
-        self.hass.components.persistent_notification.async_create(
-            title=NAME,
-            message=msg,
-            notification_id=f"midea_unknown_{new.serial_number}",
-        )
         return new_device
 
     def _admitted_known_device(self, known: dict[str, Any], new: LanDevice) -> bool:
         need_reload = False
-        if known[CONF_UNIQUE_ID] == new.serial_number:
-            if known[CONF_DISCOVERY] == DISCOVERY_WAIT:
-                update = {
-                    CONF_DISCOVERY: DISCOVERY_LAN,
-                    CONF_API_VERSION: new.version,
-                    CONF_ID: new.appliance_id,
-                    CONF_IP_ADDRESS: new.address,
-                    CONF_TOKEN_KEY: new.key,
-                    CONF_TOKEN: new.token,
-                    CONF_TYPE: new.type,
-                    CONF_UNIQUE_ID: new.serial_number,
-                }
-                _LOGGER.debug(
-                    "Updating discovered device %s, previous conf %s, conf update %s",
-                    new,
-                    known,
-                    update,
-                )
+        if known[CONF_DISCOVERY] == DISCOVERY_WAIT:
+            update = {
+                CONF_DISCOVERY: DISCOVERY_LAN,
+                CONF_API_VERSION: new.version,
+                CONF_ID: new.appliance_id,
+                CONF_IP_ADDRESS: new.address,
+                CONF_TOKEN_KEY: new.key,
+                CONF_TOKEN: new.token,
+                CONF_TYPE: new.type,
+                CONF_UNIQUE_ID: new.serial_number,
+            }
+            _LOGGER.debug(
+                "Updating discovered device %s, previous conf %s, conf update %s",
+                new,
+                known,
+                update,
+            )
 
-                msg = (
-                    "Device %(name)s,"
-                    " which was waiting to be discovered,"
-                    " was found on address %(address)s."
-                    " It will now be activated."
-                ) % {
-                    "name": known[CONF_NAME],
-                    "address": new.address,
-                }
-                self.hass.components.persistent_notification.async_create(
-                    title=NAME,
-                    message=msg,
-                    notification_id=f"midea_wait_discovery_{new.serial_number}",
-                )
-                known |= update
-                need_reload = True
-            elif new.address and known[CONF_DISCOVERY] != DISCOVERY_LAN:
-                self._possible_lan_notification(new, known, new.address)
+            msg = (
+                "Device %(name)s,"
+                " which was waiting to be discovered,"
+                " was found on address %(address)s."
+                " It will now be activated."
+            ) % {
+                "name": known[CONF_NAME],
+                "address": new.address,
+            }
+            persistent_notification.async_create(
+                self.hass,
+                msg,
+                title=NAME,
+                notification_id=f"midea_wait_discovery_{new.serial_number}",
+            )
+            known |= update
+            need_reload = True
+        elif new.address and known[CONF_DISCOVERY] != DISCOVERY_LAN:
+            self._possible_lan_notification(new, known, new.address)
 
         return need_reload
 
@@ -201,45 +214,35 @@ class ApplianceDiscoveryHelper:  # pylint: disable=too-many-instance-attributes
                 "address": address,
             }
 
-            self.hass.components.persistent_notification.async_create(
+            persistent_notification.async_create(
+                self.hass,
+                msg,
                 title=NAME,
-                message=msg,
                 notification_id=f"midea_non_lan_discovery_{device.serial_number}",
             )
 
-    def _address_generator(self, batch_size: int = DISCOVERY_BATCH_SIZE):
-        """Generator for one batch of ip addresses to scan"""
-        net_addrs = []
-        addr_count = 0
-        for addr in self.conf_addresses:
-            # If local broadcast address we don't need to expand it
-            if addr == LOCAL_BROADCAST:
-                continue
-            # Get network corresponding to address
-            net = ipaddress.IPv4Network(addr)
-            # If network references a block:
+    def _address_generator(
+        self,
+        networks: list[ipaddress.IPv4Network],
+        batch_size: int = DISCOVERY_BATCH_SIZE,
+    ):
+        """Endless generator of batches of ip addresses to scan.
+        Addresses are produced lazily and enumeration starts over once
+        all of them were scanned."""
+        nets = []
+        for net in networks:
+            # If network references a block, we will scan all its hosts
             if net.num_addresses > 1:
                 _LOGGER.debug("Block %s with %d addresses", net, net.num_addresses)
-                # collect all hosts from the block
-                net_addrs.append(net.hosts())
-                addr_count += net.num_addresses
+                nets.append(net)
 
         # If we do have addresses to scan
-        if net_addrs:
-            # we will iterate over all of available addresses in batches
-            # having batch_size items
-            all_addrs = chain(*net_addrs)
-            for _ in range(0, addr_count, batch_size):
-                yield list(
-                    # We use filter to remove empty addresses
-                    filter(
-                        None,
-                        map(
-                            (lambda _: (x := next(all_addrs)) and str(x)),
-                            range(batch_size),
-                        ),
-                    )
-                )
+        if not nets:
+            return
+        while True:
+            hosts = chain.from_iterable(net.hosts() for net in nets)
+            while batch := [str(host) for host in islice(hosts, batch_size)]:
+                yield batch
 
     async def _async_run_discovery(self, devices: list[LanDevice]) -> None:
         """Trigger config flows for discovered devices."""
@@ -269,16 +272,18 @@ class ApplianceDiscoveryHelper:  # pylint: disable=too-many-instance-attributes
     def _iterate_devices(self, devices: list[LanDevice]):
         self.new_devices.clear()
         self.changed_devices.clear()
+        known = {
+            coordinator.appliance.serial_number: coordinator
+            for coordinator in self.hub.coordinators
+        }
+        seen: set[str] = set()
         for device in devices:
-            if not device.address:
+            # Appliance can answer on more than one scanned address
+            if not device.address or device.serial_number in seen:
                 continue
-            coordinator = next(
-                (
-                    cast(ApplianceUpdateCoordinator, coord)
-                    for coord in self.hub.coordinators
-                    if coord.appliance.serial_number == device.serial_number
-                ),
-                None,
+            seen.add(device.serial_number)
+            coordinator = cast(
+                ApplianceUpdateCoordinator | None, known.get(device.serial_number)
             )
             if coordinator:
                 # If address changed, we need to handle it
@@ -295,23 +300,29 @@ class ApplianceDiscoveryHelper:  # pylint: disable=too-many-instance-attributes
 
     def _merge_with_configuration(self: ApplianceDiscoveryHelper) -> bool:
         """Merges list of changed devices with existing config entry configuration"""
-        dev_confs: list[dict[str, Any]] = self.hub.config[CONF_DEVICES]
+        if not self.changed_devices:
+            return False
+        dev_confs: dict[str, dict[str, Any]] = {
+            known[CONF_UNIQUE_ID]: known for known in self.hub.config[CONF_DEVICES]
+        }
         updated_conf = False
         for changed in self.changed_devices:
-            for known in dev_confs:
-                coordinator = changed.coordinator
-                device = changed.device
-                if known[CONF_UNIQUE_ID] == coordinator.appliance.serial_number:
-                    coordinator.appliance.address = device.address
-                    known[CONF_IP_ADDRESS] = device.address
-                    updated_conf = True
-                    if device.address and known[CONF_DISCOVERY] != DISCOVERY_LAN:
-                        self._possible_lan_notification(
-                            coordinator.appliance,
-                            known,
-                            device.address,
-                        )
-                    break
+            coordinator = changed.coordinator
+            device = changed.device
+            known = dev_confs.get(coordinator.appliance.serial_number)
+            if known is None:
+                continue
+            coordinator.appliance.address = device.address
+            # Configuration may already hold the address, e.g. after reload
+            if known[CONF_IP_ADDRESS] != device.address:
+                known[CONF_IP_ADDRESS] = device.address
+                updated_conf = True
+            if device.address and known[CONF_DISCOVERY] != DISCOVERY_LAN:
+                self._possible_lan_notification(
+                    coordinator.appliance,
+                    known,
+                    device.address,
+                )
 
         return updated_conf
 
@@ -336,16 +347,23 @@ class ApplianceDiscoveryHelper:  # pylint: disable=too-many-instance-attributes
             for item in self.hub.config.get(CONF_BROADCAST_ADDRESS, []) or []
             if item and item != LOCAL_BROADCAST
         ]
-        self.broadcast_addresses = [LOCAL_BROADCAST]
-        for addr in self.conf_addresses:
-            net = ipaddress.IPv4Network(addr)
-            self.broadcast_addresses.append(str(net.broadcast_address))
+        # Each configured address is parsed only once per setup
+        networks = [ipaddress.IPv4Network(addr) for addr in self.conf_addresses]
+        # Same broadcast address is sent to only once per discovery
+        self.broadcast_addresses = list(
+            dict.fromkeys(
+                chain(
+                    [LOCAL_BROADCAST],
+                    (str(net.broadcast_address) for net in networks),
+                )
+            )
+        )
 
         if has_discoverable and self.conf_addresses:
             _LOGGER.debug("Discovery via configured addresses %s", self.conf_addresses)
-            self.address_iterator = cycle(self._address_generator())
+            self.address_iterator = self._address_generator(networks)
         else:
-            self.address_iterator = empty_address_iterator()
+            self.address_iterator = iter(())
 
     def start(self) -> None:
         """Starts periodic disovery of devices"""
@@ -387,16 +405,24 @@ class ApplianceDiscoveryHelper:  # pylint: disable=too-many-instance-attributes
             self.remove_discovery()
             self.remove_discovery = None
 
-    async def _async_discover(self, _: datetime) -> None:
+    async def _async_discover(self, now: datetime) -> None:
         """Discover Midea appliances on configured network interfaces."""
-
-        addresses = list(address for address in self.broadcast_addresses)
+        if self._discovery_lock.locked():
+            _LOGGER.debug("Skipping discovery, previous is still running")
+            return
+        async with self._discovery_lock:
+            await self._async_discover_once(now)
+
+    async def _async_discover_once(self, _: datetime) -> None:
+        addresses = list(self.broadcast_addresses)
         if new_addresses := next(self.address_iterator, None):
             addresses += new_addresses
         if not addresses:
             iface_broadcast = await async_get_ipv4_broadcast_addresses(self.hass)
             addresses += [str(address) for address in iface_broadcast]
         _LOGGER.debug("Initiated discovery via %s", addresses)
-        result = self.hub.client.find_appliances(None, addresses, retries=1, timeout=1)
+        result = await self.hub.client.async_find_appliances(
+            addresses, retries=1, timeout=1
+        )
         if result:
             await self._async_run_discovery(result)
@@ -4,21 +4,19 @@ from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
 )
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from midea_beautiful.midea import ERROR_CODE_BUCKET_FULL, ERROR_CODE_BUCKET_REMOVED
 
 from custom_components.midea_dehumidifier_lan.const import (
-    DOMAIN,
     UNIQUE_DEHUMIDIFIER_PREFIX,
 )
 from custom_components.midea_dehumidifier_lan.appliance_coordinator import (
     ApplianceEntity,
     ApplianceUpdateCoordinator,
 )
-from custom_components.midea_dehumidifier_lan.hub import Hub
+from custom_components.midea_dehumidifier_lan.hub import MideaConfigEntry
 from custom_components.midea_dehumidifier_lan.util import is_enabled_by_capabilities
 
 
@@ -30,11 +28,11 @@ def _is_enabled(coordinator: ApplianceUpdateCoordinator, capability: str) -> boo
 
 async def async_setup_entry(
     hass: HomeAssistant,
-    config_entry: ConfigEntry,
+    config_entry: MideaConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Sets up appliance binary sensors"""
-    hub: Hub = hass.data[DOMAIN][config_entry.entry_id]
+    hub = config_entry.runtime_data
 
     # Dehumidifier sensors
     async_add_entities(
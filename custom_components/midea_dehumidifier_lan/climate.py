@@ -26,7 +26,6 @@ from homeassistant.components.climate.const import (
     HVACAction,
     HVACMode,
 )
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, PRECISION_HALVES, UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -36,11 +35,10 @@ from custom_components.midea_dehumidifier_lan.appliance_coordinator import (
 )
 from custom_components.midea_dehumidifier_lan.const import (
     ATTR_RUNNING,
-    DOMAIN,
     MAX_TARGET_TEMPERATURE,
     MIN_TARGET_TEMPERATURE,
 )
-from custom_components.midea_dehumidifier_lan.hub import Hub
+from custom_components.midea_dehumidifier_lan.hub import MideaConfigEntry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -106,11 +104,11 @@ _HVAC_ACTIONS = {
 
 async def async_setup_entry(
     hass: HomeAssistant,
-    config_entry: ConfigEntry,
+    config_entry: MideaConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Sets up air conditioner entites"""
-    hub: Hub = hass.data[DOMAIN][config_entry.entry_id]
+    hub = config_entry.runtime_data
 
     async_add_entities(
         AirConditionerEntity(c) for c in hub.coordinators if c.is_climate()
@@ -193,18 +191,18 @@ class AirConditionerEntity(ApplianceEntity, ClimateEntity):
 
         return mode
 
-    def turn_on(self, **kwargs) -> None:  # pylint: disable=unused-argument
+    async def async_turn_on(self, **kwargs) -> None:  # pylint: disable=unused-argument
         """Turn the entity on."""
-        self.apply(ATTR_RUNNING, True)
+        await self.async_apply(ATTR_RUNNING, True)
 
-    def turn_off(self, **kwargs) -> None:  # pylint: disable=unused-argument
+    async def async_turn_off(self, **kwargs) -> None:  # pylint: disable=unused-argument
         """Turn the entity off."""
-        self.apply(ATTR_RUNNING, False)
+        await self.async_apply(ATTR_RUNNING, False)
 
-    def set_hvac_mode(self, hvac_mode: HVACMode) -> None:
+    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
         if hvac_mode == HVACMode.OFF:
-            self.turn_off()
+            await self.async_turn_off()
             return
         midea_mode = _MODES_TO_MIDEA.get(hvac_mode)
         if midea_mode is None:
@@ -212,43 +210,43 @@ class AirConditionerEntity(ApplianceEntity, ClimateEntity):
             return
         # Make sure we are running
         if not self.airconditioner().running:
-            self.turn_on()
-        self.apply("mode", midea_mode)
+            await self.async_turn_on()
+        await self.async_apply("mode", midea_mode)
 
-    def set_temperature(self, **kwargs) -> None:
+    async def async_set_temperature(self, **kwargs) -> None:
         """Set new target temperature."""
         if kwargs.get(ATTR_TEMPERATURE):
-            self.apply("target_temperature", kwargs.get(ATTR_TEMPERATURE))
+            await self.async_apply("target_temperature", kwargs.get(ATTR_TEMPERATURE))
         if kwargs.get(ATTR_HVAC_MODE):
-            self.set_hvac_mode(kwargs.get(ATTR_HVAC_MODE))
+            await self.async_set_hvac_mode(kwargs.get(ATTR_HVAC_MODE))
         if kwargs.get(ATTR_SWING_MODE):
-            self.set_swing_mode(kwargs.get(ATTR_SWING_MODE))
+            await self.async_set_swing_mode(kwargs.get(ATTR_SWING_MODE))
         if kwargs.get(ATTR_FAN_MODE):
-            self.set_fan_mode(kwargs.get(ATTR_FAN_MODE))
+            await self.async_set_fan_mode(kwargs.get(ATTR_FAN_MODE))
 
-    def set_swing_mode(self, swing_mode: str) -> None:
+    async def async_set_swing_mode(self, swing_mode: str) -> None:
         if swing_mode == SWING_VERTICAL:
-            self.apply(vertical_swing=True, horizontal_swing=False)
+            await self.async_apply(vertical_swing=True, horizontal_swing=False)
         elif swing_mode == SWING_HORIZONTAL:
-            self.apply(vertical_swing=False, horizontal_swing=True)
+            await self.async_apply(vertical_swing=False, horizontal_swing=True)
         elif swing_mode == SWING_BOTH:
-            self.apply(vertical_swing=True, horizontal_swing=True)
+            await self.async_apply(vertical_swing=True, horizontal_swing=True)
         else:
-            self.apply(vertical_swing=False, horizontal_swing=False)
+            await self.async_apply(vertical_swing=False, horizontal_swing=False)
 
-    def set_fan_mode(self, fan_mode: str) -> None:
-        self.apply(fan_speed=_FAN_SPEEDS.get(fan_mode, 20))
+    async def async_set_fan_mode(self, fan_mode: str) -> None:
+        await self.async_apply(fan_speed=_FAN_SPEEDS.get(fan_mode, 20))
 
-    def set_preset_mode(self, preset_mode: str) -> None:
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
         if preset_mode == PRESET_BOOST:
-            self.apply(turbo=True, eco_mode=False, comfort_sleep=False, frost_protect=False, comfort_mode=False)
+            await self.async_apply(turbo=True, eco_mode=False, comfort_sleep=False, frost_protect=False, comfort_mode=False)
         elif preset_mode == PRESET_ECO:
-            self.apply(turbo=False, eco_mode=True, comfort_sleep=False, frost_protect=False, comfort_mode=False)
+            await self.async_apply(turbo=False, eco_mode=True, comfort_sleep=False, frost_protect=False, comfort_mode=False)
         elif preset_mode == PRESET_SLEEP:
-            self.apply(turbo=False, eco_mode=False, comfort_sleep=True, frost_protect=False, comfort_mode=False)
+            await self.async_apply(turbo=False, eco_mode=False, comfort_sleep=True, frost_protect=False, comfort_mode=False)
         elif preset_mode == PRESET_AWAY:
-            self.apply(turbo=False, eco_mode=False, comfort_sleep=False, frost_protect=True, comfort_mode=False)
+            await self.async_apply(turbo=False, eco_mode=False, comfort_sleep=False, frost_protect=True, comfort_mode=False)
         elif preset_mode == PRESET_SLEEP:
-            self.apply(turbo=False, eco_mode=False, comfort_sleep=False, frost_protect=False, comfort_mode=True)
+            await self.async_apply(turbo=False, eco_mode=False, comfort_sleep=False, frost_protect=False, comfort_mode=True)
         else:
-            self.apply(turbo=False, eco_mode=False, comfort_sleep=False, frost_protect=False, comfort_mode=False)
+            await self.async_apply(turbo=False, eco_mode=False, comfort_sleep=False, frost_protect=False, comfort_mode=False)
@@ -65,6 +65,7 @@ from custom_components.midea_dehumidifier_lan.const import (
     DISCOVERY_IGNORE,
     DISCOVERY_LAN,
     DISCOVERY_MODE_LABELS,
+    DISCOVERY_MODES,
     DISCOVERY_WAIT,
     DOMAIN,
     LOCAL_BROADCAST,
@@ -339,12 +340,7 @@ class _MideaFlow(FlowHandler):
                 self._check_ip_address_unique(ip_address)
 
                 discovery_mode = user_input.get(CONF_DISCOVERY, discovery_mode)
-                if discovery_mode not in [
-                    DISCOVERY_WAIT,
-                    DISCOVERY_LAN,
-                    DISCOVERY_IGNORE,
-                    DISCOVERY_CLOUD,
-                ]:
+                if discovery_mode not in DISCOVERY_MODES:
                     discovery_mode = (
                         DISCOVERY_LAN if address_ok(ip_address) else DISCOVERY_CLOUD
                     )
@@ -705,11 +701,13 @@ class MideaOptionsFlow(OptionsFlow, _MideaFlow):
 
     def _build_appliance_list(self) -> None:
         assert self.config_entry
-        hub: Hub = self.hass.data[DOMAIN][self.config_entry.entry_id]
+        # Entry waiting to retry setup has no hub yet, only configuration
+        hub: Hub | None = getattr(self.config_entry, "runtime_data", None)
+        coordinators = hub.coordinators if hub else ()
         self.appliances.clear()
         self.devices_conf = self.conf[CONF_DEVICES]
         for device in self.devices_conf:
-            for coord in hub.coordinators:
+            for coord in coordinators:
                 if device[CONF_UNIQUE_ID] == coord.appliance.serial_number:
                     self.appliances.append(coord.appliance)
                     break
@@ -41,7 +41,21 @@ CURRENT_CONFIG_VERSION: Final = 3
 # Wait half a second between successive refresh calls
 APPLIANCE_REFRESH_COOLDOWN: Final = 0.5
 APPLIANCE_REFRESH_INTERVAL: Final = 60
+# Longest pause in polling of unresponsive appliance, in seconds
+APPLIANCE_MAX_BACKOFF: Final = 300
 DEFAULT_SCAN_INTERVAL: Final = 15
+# Maximum number of appliances polled in parallel during setup
+APPLIANCE_SETUP_CONCURRENCY: Final = 8
+# Maximum number of appliances refreshed in parallel, leaves room for setup
+APPLIANCE_REFRESH_CONCURRENCY: Final = 4
+# Maximum time in seconds to wait for a single appliance or cloud call
+APPLIANCE_CALL_TIMEOUT: Final = 30
+# How long setup waits for first refresh of appliances, in seconds
+APPLIANCE_FIRST_REFRESH_WAIT: Final = 2
+# How long Midea cloud session is reused between reloads, in seconds
+CLOUD_SESSION_TTL: Final = 3600
+# How long results of network scan for appliances are reused, in seconds
+DISCOVERY_CACHE_TTL: Final = 30
 MIN_SCAN_INTERVAL: Final = 2
 
 ATTR_FAN_SPEED: Final = "fan_speed"
@@ -69,6 +83,9 @@ DISCOVERY_LAN = "LAN"
 DISCOVERY_CLOUD = "CLOUD"
 DISCOVERY_WAIT = "WAIT"
 DEFAULT_DISCOVERY_MODE = DISCOVERY_LAN
+DISCOVERY_MODES: Final = frozenset(
+    (DISCOVERY_IGNORE, DISCOVERY_LAN, DISCOVERY_CLOUD, DISCOVERY_WAIT)
+)
 
 DISCOVERY_BATCH_SIZE: Final = 64
 
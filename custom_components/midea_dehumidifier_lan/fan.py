@@ -7,16 +7,15 @@ from homeassistant.components.fan import (
     FanEntityFeature,
     FanEntity,
 )
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from custom_components.midea_dehumidifier_lan.const import ATTR_FAN_SPEED, DOMAIN
+from custom_components.midea_dehumidifier_lan.const import ATTR_FAN_SPEED
 from custom_components.midea_dehumidifier_lan.appliance_coordinator import (
     ApplianceEntity,
     ApplianceUpdateCoordinator,
 )
-from custom_components.midea_dehumidifier_lan.hub import Hub
+from custom_components.midea_dehumidifier_lan.hub import MideaConfigEntry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,12 +35,12 @@ _ON_SPEED = {2: MODE_AUTO, 3: MODE_HIGH, 7: MODE_HIGH}
 
 async def async_setup_entry(
     hass: HomeAssistant,
-    config_entry: ConfigEntry,
+    config_entry: MideaConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Sets up fan entity for dehumidifer"""
 
-    hub: Hub = hass.data[DOMAIN][config_entry.entry_id]
+    hub = config_entry.runtime_data
 
     async_add_entities(
         DehumidiferFan(c) for c in hub.coordinators if c.is_dehumidifier()
@@ -98,22 +97,22 @@ class DehumidiferFan(ApplianceEntity, FanEntity):
         else:
             self._attr_preset_mode = MODE_NONE
 
-    def set_preset_mode(self, preset_mode: str) -> None:
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode of the fan."""
         speed = self._fan_speeds.get(preset_mode, None)
         _LOGGER.debug("Setting speed to %s", speed)
         if speed is not None:
-            self.apply(ATTR_FAN_SPEED, speed)
+            await self.async_apply(ATTR_FAN_SPEED, speed)
         else:
             _LOGGER.warning("Unsupported fan mode %s", preset_mode)
 
-    def set_percentage(self, percentage: int) -> None:
+    async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed percentage of the fan."""
         _LOGGER.debug("Setting percentage to %s", percentage)
 
-        self.apply(ATTR_FAN_SPEED, percentage)
+        await self.async_apply(ATTR_FAN_SPEED, percentage)
 
-    def turn_on(
+    async def async_turn_on(
         self,
         speed: str = None,
         percentage: int = None,
@@ -123,10 +122,10 @@ class DehumidiferFan(ApplianceEntity, FanEntity):
         """Turns fan to medium speed."""
         updated = False
         if preset_mode is not None:
-            self.set_preset_mode(preset_mode)
+            await self.async_set_preset_mode(preset_mode)
             updated = True
         if percentage is not None:
-            self.set_percentage(percentage)
+            await self.async_set_percentage(percentage)
             updated = True
         if speed is not None:
             self.set_speed(speed)
@@ -136,8 +135,8 @@ class DehumidiferFan(ApplianceEntity, FanEntity):
             not updated
             and (self._attr_percentage or 0) < self._fan_speeds[self._on_speed]
         ):
-            self.set_preset_mode(self._on_speed)
+            await self.async_set_preset_mode(self._on_speed)
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turns fan to silent speed."""
-        self.set_preset_mode(MODE_LOW)
+        await self.async_set_preset_mode(MODE_LOW)
@@ -3,6 +3,10 @@
 
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
 import logging
 from typing import Any, Tuple
 
@@ -20,9 +24,11 @@ from homeassistant.const import (
     CONF_UNIQUE_ID,
     CONF_USERNAME,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
-from midea_beautiful.exceptions import AuthenticationError
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from midea_beautiful.cloud import MideaCloud
+from midea_beautiful.exceptions import AuthenticationError, MideaError
 from midea_beautiful.lan import LanDevice
 
 from custom_components.midea_dehumidifier_lan.appliance_coordinator import (
@@ -32,10 +38,15 @@ from custom_components.midea_dehumidifier_lan.appliance_discovery import (
     ApplianceDiscoveryHelper,
 )
 from custom_components.midea_dehumidifier_lan.const import (
+    APPLIANCE_CALL_TIMEOUT,
+    APPLIANCE_FIRST_REFRESH_WAIT,
+    APPLIANCE_REFRESH_INTERVAL,
+    APPLIANCE_SETUP_CONCURRENCY,
     CONF_TOKEN_KEY,
     DISCOVERY_CLOUD,
     DISCOVERY_IGNORE,
     DISCOVERY_LAN,
+    DISCOVERY_MODES,
     DISCOVERY_WAIT,
     NAME,
     UNKNOWN_IP,
@@ -58,12 +69,7 @@ def _assure_valid_device_configuration(
     For example, if discovery mode is not set-up corectly it will try to deduce
     correct setting."""
     discovery_mode = device.get(CONF_DISCOVERY)
-    if discovery_mode in [
-        DISCOVERY_IGNORE,
-        DISCOVERY_WAIT,
-        DISCOVERY_LAN,
-        DISCOVERY_CLOUD,
-    ]:
+    if discovery_mode in DISCOVERY_MODES:
         return True
     ip_address = device.get(CONF_IP_ADDRESS)
     token = device.get(CONF_TOKEN)
@@ -85,6 +91,12 @@ def _assure_valid_device_configuration(
     return False
 
 
+async def _async_staggered_refresh(
+    coordinator: ApplianceUpdateCoordinator, _: datetime
+) -> None:
+    await coordinator.async_refresh()
+
+
 def _get_placeholder_appliance(device: dict[str, Any]) -> LanDevice:
     appliance = LanDevice(
         appliance_id=device[CONF_ID],
@@ -105,49 +117,125 @@ class Hub(AbstractHub):  # pylint: disable=too-many-instance-attributes
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
         super().__init__(hass, config_entry)
         self.discovery = ApplianceDiscoveryHelper(self)
-        self.coordinators: list[ApplianceUpdateCoordinator] = []
+        self.coordinators: tuple[ApplianceUpdateCoordinator, ...] = ()
         self.updated_conf = False
+        self._cloud_task: asyncio.Task[MideaCloud] | None = None
+        self._setup_semaphore = asyncio.Semaphore(APPLIANCE_SETUP_CONCURRENCY)
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+        self._unsub_staggered: list[CALLBACK_TYPE] = []
 
     async def async_unload(self) -> None:
         """Stops discovery and coordinators"""
         _LOGGER.debug("Unloading hub")
 
         self.discovery.stop()
+        self._stop_refreshes()
+        # Debounced refreshes must not submit jobs to executor after shutdown
         for coordinator in self.coordinators:
-            # Stop coordinators
-            coordinator.update_interval = None
+            await coordinator.async_shutdown()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
 
     async def async_update_config(self) -> None:
         """Updates config entry from Hub's data"""
         self.hass.config_entries.async_update_entry(self.config_entry, data=self.config)
 
+    def forget_cloud(self) -> None:
+        """Drops cloud session that was rejected by Midea cloud, including
+        cached one, so that next connection logs in again"""
+        self.cloud = None
+        self._cloud_task = None
+        self.client.forget_cloud(self.config)
+
     async def async_setup(self) -> None:
         """Sets up appliances and creates an update coordinator for
         each one
         """
         self.discovery.stop()
+        self._stop_refreshes()
+        self.coordinators = ()
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=APPLIANCE_SETUP_CONCURRENCY,
+                thread_name_prefix="midea_lan",
+            )
         self.config = {**self.config_entry.data}
         devices = [{**device} for device in self.config.get(CONF_DEVICES, [])]
         self.config[CONF_DEVICES] = devices
         self.errors = {}
         self.updated_conf = False
 
-        devices = []
-        for device in self.config[CONF_DEVICES]:
+        for device in devices:
             if not _assure_valid_device_configuration(self.config, device):
                 self.updated_conf = True
-            coordinator = await self._process_appliance(device)
-            if coordinator and coordinator.available:
-                await coordinator.async_config_entry_first_refresh()
-            devices.append(device)
+        # Appliances are set up concurrently, so startup time depends on
+        # the slowest appliance and not on the sum of all of them
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(self._process_appliance(device))
+                    for device in devices
+                ]
+        except ExceptionGroup as ex:
+            # Remaining setups were cancelled, report failure as Home Assistant
+            # expects it, e.g. ConfigEntryAuthFailed starts reauthentication
+            raise ex.exceptions[0] from None
+        self.coordinators = tuple(filter(None, (task.result() for task in tasks)))
+        # First refresh runs in background, so that offline or slow appliances
+        # don't delay setup. Fast ones will still have fresh data.
+        refresh_tasks = [
+            self.config_entry.async_create_background_task(
+                self.hass,
+                coordinator.async_refresh(),
+                name=f"{coordinator.name} first refresh",
+            )
+            for coordinator in self.coordinators
+            if coordinator.available
+        ]
+        if refresh_tasks:
+            await asyncio.wait(refresh_tasks, timeout=APPLIANCE_FIRST_REFRESH_WAIT)
 
         if self.updated_conf:
             await self.async_update_config()
 
+        self._start_refreshes()
         self.discovery.start()
 
         self._notify_setup_errors()
 
+    def _start_refreshes(self) -> None:
+        """Starts single periodic refresh cycle shared by all appliances.
+        Coordinators don't have their own timers. In each cycle the hub
+        spreads their refreshes evenly over the refresh interval, so that
+        blocking appliance calls don't all start at the same time."""
+        if self.coordinators:
+            self._unsub_refresh = async_track_time_interval(
+                self.hass,
+                self._schedule_refreshes,
+                timedelta(seconds=APPLIANCE_REFRESH_INTERVAL),
+                name=f"{NAME} appliance refresh",
+            )
+
+    def _stop_refreshes(self) -> None:
+        if self._unsub_refresh:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+        for unsub in self._unsub_staggered:
+            unsub()
+        self._unsub_staggered = []
+
+    @callback
+    def _schedule_refreshes(self, _: datetime) -> None:
+        # Refreshes of previous cycle have all started by now
+        step = APPLIANCE_REFRESH_INTERVAL / len(self.coordinators)
+        self._unsub_staggered = [
+            async_call_later(
+                self.hass, index * step, partial(_async_staggered_refresh, coordinator)
+            )
+            for index, coordinator in enumerate(self.coordinators)
+        ]
+
     def _notify_setup_errors(self):
         if self.errors:
             if not self.coordinators:
@@ -178,22 +266,21 @@ class Hub(AbstractHub):  # pylint: disable=too-many-instance-attributes
         discovery_mode = device.get(CONF_DISCOVERY)
 
         use_cloud = discovery_mode == DISCOVERY_CLOUD
-        need_cloud = use_cloud
         lan_mode = discovery_mode == DISCOVERY_LAN
         version = device.get(CONF_API_VERSION, 3)
-        need_token = (
-            discovery_mode == DISCOVERY_LAN
-            and version >= 3
-            and (not device.get(CONF_TOKEN) or not device.get(CONF_TOKEN_KEY))
-        )
+        token = device.get(CONF_TOKEN)
+        key = device.get(CONF_TOKEN_KEY)
+        unique_id = device.get(CONF_UNIQUE_ID)
+        need_token = lan_mode and version >= 3 and not (token and key)
+        # Token of LAN appliance is obtained from cloud
+        need_cloud = use_cloud or need_token
         if need_token:
             _LOGGER.debug(
                 "Appliance %s %s has no token,"
                 " trying to obtain it from Midea cloud API",
                 device.get(CONF_NAME),
-                device.get(CONF_UNIQUE_ID),
+                unique_id,
             )
-            need_cloud = True
         if not await self._async_get_cloud_if_needed(device, need_cloud, need_token):
             return need_token, None
         ip_address = device[CONF_IP_ADDRESS] if lan_mode else None
@@ -201,39 +288,43 @@ class Hub(AbstractHub):  # pylint: disable=too-many-instance-attributes
             _LOGGER.error(
                 "Missing ip_address and cloud discovery is not used for %s."
                 "Will fall-back to cloud discovery, full configuration is %s",
-                device.get(CONF_UNIQUE_ID),
+                unique_id,
                 RedactedConf(self.config),
             )
             use_cloud = True
         appliance = None
         try:
-            appliance = await self.hass.async_add_executor_job(
-                self.client.appliance_state,
-                device[CONF_IP_ADDRESS] if lan_mode else None,
-                device.get(CONF_TOKEN),
-                device.get(CONF_TOKEN_KEY),
-                self.cloud,
-                use_cloud,
-                device[CONF_ID],
-            )
+            async with self._setup_semaphore:
+                appliance = await self.async_add_appliance_job(
+                    self.client.appliance_state,
+                    ip_address,
+                    token,
+                    key,
+                    self.cloud,
+                    use_cloud,
+                    device[CONF_ID],
+                )
 
         except Exception as ex:  # pylint: disable=broad-except
+            cause = str(ex) or "request timed out"
             self.errors[
-                device[CONF_UNIQUE_ID]
-            ] = f"Unable to get state of device {device[CONF_NAME]}: {ex}"
+                unique_id
+            ] = f"Unable to get state of device {device[CONF_NAME]}: {cause}"
             if initial_discovery:
                 _LOGGER.error(
                     "Error '%s' while setting up appliance %s,"
                     " full configuration %s",
-                    ex,
-                    device.get(CONF_UNIQUE_ID),
+                    cause,
+                    unique_id,
                     RedactedConf(self.config),
-                    exc_info=True,
+                    # Unreachable appliance is expected, traceback doesn't help
+                    exc_info=not isinstance(ex, (MideaError, TimeoutError))
+                    or _LOGGER.isEnabledFor(logging.DEBUG),
                 )
             else:
                 _LOGGER.debug(
                     "Error '%s' while setting up appliance %s",
-                    ex,
+                    cause,
                     RedactedConf(device),
                 )
         return need_token, appliance
@@ -244,16 +335,32 @@ class Hub(AbstractHub):  # pylint: disable=too-many-instance-attributes
         if need_cloud and self.cloud is None:
             self._validate_auth_config_complete(device, need_token)
             try:
-                self.cloud = await self.client.async_connect_to_cloud(self.config)
+                self.cloud = await self._async_get_cloud()
             except AuthenticationError as ex:
                 raise ConfigEntryAuthFailed(
                     f"Unable to login to Midea cloud {ex}"
                 ) from ex
             except Exception as ex:  # pylint: disable=broad-except
-                self.errors[device[CONF_UNIQUE_ID]] = str(ex)
+                self.errors[device[CONF_UNIQUE_ID]] = str(ex) or "request timed out"
                 return False
         return True
 
+    async def _async_get_cloud(self) -> MideaCloud:
+        """Connects to Midea cloud once, concurrent callers share the same
+        connection attempt"""
+        if (task := self._cloud_task) is None:
+            task = self._cloud_task = self.hass.async_create_task(
+                self.client.async_connect_to_cloud(self.config)
+            )
+        try:
+            async with asyncio.timeout(APPLIANCE_CALL_TIMEOUT):
+                return await asyncio.shield(task)
+        except Exception:
+            # Failed attempt is not cached, next caller will try again
+            if self._cloud_task is task:
+                self._cloud_task = None
+            raise
+
     def _validate_auth_config_complete(self, device, need_token):
         if not self.config.get(CONF_USERNAME) or not self.config.get(CONF_PASSWORD):
             if not device:
@@ -282,7 +389,6 @@ class Hub(AbstractHub):  # pylint: disable=too-many-instance-attributes
         )
 
         _LOGGER.debug("Created coordinator for %s", RedactedConf(device))
-        self.coordinators.append(coordinator)
         return coordinator
 
     def _update_token(
@@ -301,3 +407,6 @@ class Hub(AbstractHub):  # pylint: disable=too-many-instance-attributes
             device[CONF_API_VERSION] = appliance.version
             self.updated_conf = True
             _LOGGER.debug("Updating version for %s", appliance)
+
+
+MideaConfigEntry = ConfigEntry[Hub]
@@ -5,7 +5,6 @@ from typing import Final
 
 from homeassistant.components.humidifier import HumidifierDeviceClass, HumidifierEntity
 from homeassistant.components.humidifier.const import HumidifierEntityFeature
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -19,7 +18,7 @@ from custom_components.midea_dehumidifier_lan.appliance_coordinator import (
     ApplianceEntity,
     ApplianceUpdateCoordinator,
 )
-from custom_components.midea_dehumidifier_lan.hub import Hub
+from custom_components.midea_dehumidifier_lan.hub import MideaConfigEntry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,11 +35,11 @@ ENTITY_ID_FORMAT = DOMAIN + ".{}"
 
 async def async_setup_entry(
     hass: HomeAssistant,
-    config_entry: ConfigEntry,
+    config_entry: MideaConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Sets up dehumidifier entites"""
-    hub: Hub = hass.data[DOMAIN][config_entry.entry_id]
+    hub = config_entry.runtime_data
 
     async_add_entities(
         DehumidifierEntity(c) for c in hub.coordinators if c.is_dehumidifier()
@@ -104,22 +103,22 @@ class DehumidifierEntity(ApplianceEntity, HumidifierEntity):
         self._attr_is_on = dehumi.running
         super().on_update()
 
-    def turn_on(self, **kwargs) -> None:  # pylint: disable=unused-argument
+    async def async_turn_on(self, **kwargs) -> None:  # pylint: disable=unused-argument
         """Turn the entity on."""
-        self.apply(ATTR_RUNNING, True)
+        await self.async_apply(ATTR_RUNNING, True)
 
-    def turn_off(self, **kwargs) -> None:  # pylint: disable=unused-argument
+    async def async_turn_off(self, **kwargs) -> None:  # pylint: disable=unused-argument
         """Turn the entity off."""
-        self.apply(ATTR_RUNNING, False)
+        await self.async_apply(ATTR_RUNNING, False)
 
-    def set_mode(self, mode) -> None:
+    async def async_set_mode(self, mode) -> None:
         """Set new target preset mode."""
         midea_mode = next((i[0] for i in _MODES if i[1] == mode), None)
         if midea_mode is None:
             _LOGGER.debug("Unsupported dehumidifer mode %s", mode)
             midea_mode = 1
-        self.apply("mode", midea_mode)
+        await self.async_apply("mode", midea_mode)
 
-    def set_humidity(self, humidity) -> None:
+    async def async_set_humidity(self, humidity) -> None:
         """Set new target humidity."""
-        self.apply("target_humidity", humidity)
+        await self.async_apply("target_humidity", humidity)
@@ -5,7 +5,6 @@ from homeassistant.components.sensor import (
     SensorStateClass,
     SensorDeviceClass
 )
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
     UnitOfTemperature,
@@ -16,18 +15,18 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from custom_components.midea_dehumidifier_lan.appliance_coordinator import (
     ApplianceEntity,
 )
-from custom_components.midea_dehumidifier_lan.const import DOMAIN, UNIQUE_CLIMATE_PREFIX
-from custom_components.midea_dehumidifier_lan.hub import Hub
+from custom_components.midea_dehumidifier_lan.const import UNIQUE_CLIMATE_PREFIX
+from custom_components.midea_dehumidifier_lan.hub import MideaConfigEntry
 
 
 async def async_setup_entry(
     hass: HomeAssistant,
-    config_entry: ConfigEntry,
+    config_entry: MideaConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Sets up current environment humidity and temperature sensors"""
 
-    hub: Hub = hass.data[DOMAIN][config_entry.entry_id]
+    hub = config_entry.runtime_data
 
     # Dehumidifier sensors
     async_add_entities(
@@ -3,12 +3,11 @@
 from dataclasses import dataclass
 from typing import Final
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from custom_components.midea_dehumidifier_lan.hub import (
-    Hub,
+    MideaConfigEntry,
 )
 from custom_components.midea_dehumidifier_lan.appliance_coordinator import (
     ApplianceEntity,
@@ -16,7 +15,6 @@ from custom_components.midea_dehumidifier_lan.appliance_coordinator import (
 )
 from custom_components.midea_dehumidifier_lan.const import (
     ENTITY_DISABLED_BY_DEFAULT,
-    DOMAIN,
     UNIQUE_CLIMATE_PREFIX,
     UNIQUE_DEHUMIDIFIER_PREFIX,
 )
@@ -129,12 +127,12 @@ def _is_enabled(
 
 async def async_setup_entry(
     hass: HomeAssistant,
-    config_entry: ConfigEntry,
+    config_entry: MideaConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Sets up appliance switches"""
 
-    hub: Hub = hass.data[DOMAIN][config_entry.entry_id]
+    hub = config_entry.runtime_data
 
     switches = []
     # Dehumidifier sensors
@@ -173,10 +171,10 @@ class MideaSwitch(ApplianceEntity, SwitchEntity):
     def on_update(self) -> None:
         self._attr_is_on = getattr(self.appliance.state, self._attribute_name, None)
 
-    def turn_on(self, **kwargs) -> None:
+    async def async_turn_on(self, **kwargs) -> None:
         """Turn the entity on."""
-        self.apply(self._attribute_name, True)
+        await self.async_apply(self._attribute_name, True)
 
-    def turn_off(self, **kwargs) -> None:
+    async def async_turn_off(self, **kwargs) -> None:
         """Turn the entity off."""
-        self.apply(self._attribute_name, False)
+        await self.async_apply(self._attribute_name, False)
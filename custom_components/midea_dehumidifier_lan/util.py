@@ -3,8 +3,13 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from typing import Any, Tuple, cast, final
+from functools import partial
+from hashlib import sha256
+from time import monotonic
+from typing import Any, Callable, Tuple, TypeVar, cast, final
 
 import homeassistant.components.logger as hass_logger
 from homeassistant.config_entries import ConfigEntry
@@ -30,15 +35,25 @@ from midea_beautiful.util import very_verbose
 
 from custom_components.midea_dehumidifier_lan.const import (
     _ALWAYS_CREATE,
+    APPLIANCE_CALL_TIMEOUT,
+    APPLIANCE_REFRESH_CONCURRENCY,
+    CLOUD_SESSION_TTL,
     CONF_MOBILE_APP,
     CONF_TOKEN_KEY,
+    DISCOVERY_CACHE_TTL,
+    DOMAIN,
     UNKNOWN_IP,
 )
 
-_SUPPORTABLE_APPLIANCES = {
-    APPLIANCE_TYPE_AIRCON: AirConditionerAppliance.supported,
-    APPLIANCE_TYPE_DEHUMIDIFIER: DehumidifierAppliance.supported,
-}
+_T = TypeVar("_T")
+
+_CLOUD_CACHE = "cloud_cache"
+_SCAN_CACHE = "scan_cache"
+
+_SUPPORTABLE_APPLIANCES = (
+    (APPLIANCE_TYPE_AIRCON, AirConditionerAppliance.supported),
+    (APPLIANCE_TYPE_DEHUMIDIFIER, DehumidifierAppliance.supported),
+)
 
 
 def _redact(data: dict[str, Any], key: str, char="*", length: int = 0) -> None:
@@ -68,7 +83,7 @@ class RedactedConf:
 
     @property
     def __dict__(self) -> dict[str, Any]:
-        conf = deepcopy(self.conf)
+        conf = deepcopy(dict(self.conf))
         _redact(conf, CONF_USERNAME)
         _redact(conf, CONF_PASSWORD)
         _redact_device_conf(conf)
@@ -106,10 +121,11 @@ def is_dehumidifier(appliance: LanDevice) -> bool:
 def supported_appliance(conf: dict, appliance: LanDevice) -> bool:
     """Checks if appliance is supported by integration"""
     included = conf.get(CONF_INCLUDE, [])
-    for type_id, check in _SUPPORTABLE_APPLIANCES.items():
-        if type_id in included and check(appliance.type):
-            return True
-    return False
+    return any(
+        check(appliance.type)
+        for type_id, check in _SUPPORTABLE_APPLIANCES
+        if type_id in included
+    )
 
 
 class ApplianceCoordinator(ABC):  # pylint: disable=too-few-public-methods
@@ -141,7 +157,7 @@ class ApplianceCoordinator(ABC):  # pylint: disable=too-few-public-methods
 class AbstractHub(ABC):
     """Interface for central class for interacting with appliances"""
 
-    coordinators: list[ApplianceCoordinator]
+    coordinators: tuple[ApplianceCoordinator, ...]
     config: dict[str, Any]
     errors: dict[str, Any]
 
@@ -150,6 +166,17 @@ class AbstractHub(ABC):
         self.cloud: MideaCloud | None = None
         self.hass = hass
         self.config_entry = config_entry
+        self.executor: ThreadPoolExecutor | None = None
+        self.refresh_semaphore = asyncio.Semaphore(APPLIANCE_REFRESH_CONCURRENCY)
+
+    async def async_add_appliance_job(self, target: Callable[..., _T], *args) -> _T:
+        """Runs blocking appliance call on hub's worker threads.
+        Falls back to default executor if hub has none.
+        Raises TimeoutError if call takes longer than APPLIANCE_CALL_TIMEOUT.
+        Worker thread can't be interrupted, it finishes the call in background
+        and its result is discarded."""
+        async with asyncio.timeout(APPLIANCE_CALL_TIMEOUT):
+            return await self.hass.loop.run_in_executor(self.executor, target, *args)
 
     @abstractmethod
     async def async_discover_device(
@@ -162,6 +189,10 @@ class AbstractHub(ABC):
     async def async_update_config(self) -> None:
         """Updates config entry from Hub's data"""
 
+    @abstractmethod
+    def forget_cloud(self) -> None:
+        """Drops cloud session that was rejected by Midea cloud"""
+
 
 class MideaClient:
     """Delegate to midea API"""
@@ -180,11 +211,29 @@ class MideaClient:
             )
 
     async def async_connect_to_cloud(self, conf: dict[str, Any]) -> MideaCloud:
-        """Delegate to midea_beautiful_api.connect_to_cloud"""
-        return await self.hass.async_add_executor_job(
+        """Delegate to midea_beautiful_api.connect_to_cloud.
+        Session is reused across reloads while it is younger than
+        CLOUD_SESSION_TTL."""
+        cache = self._cloud_cache()
+        key = _cloud_cache_key(conf)
+        if (cached := cache.get(key)) and monotonic() - cached[1] < CLOUD_SESSION_TTL:
+            return cached[0]
+        cloud = await self.hass.async_add_executor_job(
             self.connect_to_cloud,
             conf,
         )
+        cache[key] = (cloud, monotonic())
+        return cloud
+
+    def forget_cloud(self, conf: dict[str, Any]) -> None:
+        """Drops cached cloud session, next connection will log in again"""
+        self._cloud_cache().pop(_cloud_cache_key(conf), None)
+
+    def _cloud_cache(self) -> dict[str, tuple[MideaCloud, float]]:
+        return self.hass.data.setdefault(DOMAIN, {}).setdefault(_CLOUD_CACHE, {})
+
+    def _scan_cache(self) -> dict[tuple, tuple[list[LanDevice], float]]:
+        return self.hass.data.setdefault(DOMAIN, {}).setdefault(_SCAN_CACHE, {})
 
     # pylint: disable=no-self-use
     def connect_to_cloud(self, conf: dict[str, Any]) -> MideaCloud:
@@ -231,6 +280,30 @@ class MideaClient:
             timeout=timeout,
         )
 
+    async def async_find_appliances(
+        self, addresses: list[str], retries: int = 3, timeout: int = 3
+    ) -> list[LanDevice]:
+        """Scans addresses for appliances in executor.
+        Results are shared by all entries scanning same addresses within
+        DISCOVERY_CACHE_TTL."""
+        cache = self._scan_cache()
+        now = monotonic()
+        for stale in [k for k, v in cache.items() if now - v[1] >= DISCOVERY_CACHE_TTL]:
+            del cache[stale]
+        key = (frozenset(addresses), retries, timeout)
+        if cached := cache.get(key):
+            return cached[0]
+        result = await self.hass.async_add_executor_job(
+            partial(
+                self.find_appliances,
+                addresses=addresses,
+                retries=retries,
+                timeout=timeout,
+            )
+        )
+        cache[key] = (result, monotonic())
+        return result
+
     # pylint: disable=no-self-use
     async def async_list_appliances(self, cloud: MideaCloud) -> list:
         """Delegate to midea_beautiful_api.connect_to_cloud"""
@@ -239,6 +312,12 @@ class MideaClient:
         )
 
 
+def _cloud_cache_key(conf: dict[str, Any]) -> str:
+    # Only a digest of credentials is kept in hass.data, not the password
+    credentials = (conf[CONF_USERNAME], conf[CONF_PASSWORD], conf[CONF_MOBILE_APP])
+    return sha256("\0".join(credentials).encode()).hexdigest()
+
+
 def address_ok(address: str | None) -> bool:
     """Returns True if address is not known"""
     return address is not None and address != UNKNOWN_IP
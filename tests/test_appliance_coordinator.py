@@ -0,0 +1,228 @@
+"""Test appliance update coordinator"""
+# pylint: disable=unused-argument,protected-access
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from homeassistant.config_entries import SOURCE_REAUTH, current_entry
+from homeassistant.const import (
+    CONF_DEVICES,
+    CONF_DISCOVERY,
+    CONF_PASSWORD,
+    CONF_TTL,
+    CONF_USERNAME,
+)
+from homeassistant.core import HomeAssistant
+from midea_beautiful.exceptions import CloudAuthenticationError, MideaError
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from custom_components.midea_dehumidifier_lan.appliance_coordinator import (
+    ApplianceUpdateCoordinator,
+)
+from custom_components.midea_dehumidifier_lan.const import (
+    CONF_MOBILE_APP,
+    DEFAULT_APP,
+    DISCOVERY_CLOUD,
+    DISCOVERY_LAN,
+    DOMAIN,
+)
+from custom_components.midea_dehumidifier_lan.hub import Hub
+from custom_components.midea_dehumidifier_lan.util import MideaClient
+
+MODULE = "custom_components.midea_dehumidifier_lan.appliance_coordinator"
+
+
+@pytest.fixture(name="clock")
+def clock_fixture():
+    """Controls monotonic time seen by coordinator, backoff takes longest delay"""
+    now = [1000.0]
+    with patch(f"{MODULE}.monotonic", side_effect=lambda: now[0]), patch(
+        f"{MODULE}.random.uniform", side_effect=lambda low, high: high
+    ):
+        yield now
+
+
+def _coordinator(
+    hass: HomeAssistant, appliance, available: bool = True, ttl: int = 2
+) -> ApplianceUpdateCoordinator:
+    hub = Mock(
+        cloud=None,
+        config={},
+        errors={},
+        refresh_semaphore=asyncio.Semaphore(4),
+        async_add_appliance_job=AsyncMock(),
+    )
+    device = {CONF_DISCOVERY: DISCOVERY_LAN, CONF_TTL: ttl}
+    return ApplianceUpdateCoordinator(hass, hub, appliance, device, available)
+
+
+async def test_backoff_keeps_failure_after_ttl(
+    hass: HomeAssistant, dehumidifier_mock, clock
+):
+    """Test that failing appliance is backed off and skipped polls don't
+    report it as recovered"""
+    coordinator = _coordinator(hass, dehumidifier_mock, ttl=2)
+    job = coordinator.hub.async_add_appliance_job
+    job.side_effect = MideaError("offline")
+
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.next_attempt_time == 1060
+
+    clock[0] = 1030
+    await coordinator.async_refresh()
+    assert job.call_count == 1
+
+    clock[0] = 1060
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.next_attempt_time == 1180
+    assert job.call_count == 2
+
+    # Appliance failed for longer than its TTL of two minutes
+    clock[0] = 1180
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert coordinator.next_attempt_time == 1420
+
+    clock[0] = 1200
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert job.call_count == 3
+
+    clock[0] = 1420
+    job.side_effect = None
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.failure_count == 0
+    assert coordinator.next_attempt_time == 0
+    assert job.call_count == 4
+
+
+async def test_backoff_keeps_detection_failure(
+    hass: HomeAssistant, dehumidifier_mock, clock
+):
+    """Test that unavailable appliance is not reported as recovered while
+    its detection is backed off"""
+    coordinator = _coordinator(hass, dehumidifier_mock, available=False)
+    detect = coordinator.hub.async_discover_device = AsyncMock(
+        return_value=(False, None)
+    )
+
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert coordinator.next_attempt_time == 1060
+
+    clock[0] = 1030
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    detect.assert_awaited_once()
+
+    clock[0] = 1060
+    detect.return_value = (False, dehumidifier_mock)
+    coordinator.hub.async_update_config = AsyncMock()
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.available
+    assert detect.await_count == 2
+
+
+async def test_overlapping_refresh_is_skipped(hass: HomeAssistant, dehumidifier_mock):
+    """Test that refresh overlapping running poll is skipped, but pending
+    changes wait for it and are applied"""
+    coordinator = _coordinator(hass, dehumidifier_mock)
+    job = coordinator.hub.async_add_appliance_job
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _slow_job(target, *args):
+        if not started.is_set():
+            started.set()
+            await release.wait()
+
+    job.side_effect = _slow_job
+    first = asyncio.create_task(coordinator._async_appliance_refresh())
+    await started.wait()
+
+    assert await coordinator._async_appliance_refresh() is dehumidifier_mock
+    assert job.call_count == 1
+
+    coordinator.updating = {"target_humidity": 45}
+    second = asyncio.create_task(coordinator._async_appliance_refresh())
+    await asyncio.sleep(0)
+    assert job.call_count == 1
+
+    release.set()
+    await asyncio.gather(first, second)
+    assert job.call_count == 2
+    assert job.call_args.args[0] == coordinator._apply_and_refresh
+    assert dehumidifier_mock.state.target_humidity == 45
+    assert not coordinator.updating
+
+
+async def test_changes_are_coalesced(hass: HomeAssistant, dehumidifier_mock):
+    """Test that changes requested together are sent in single executor job"""
+    coordinator = _coordinator(hass, dehumidifier_mock)
+    job = coordinator.hub.async_add_appliance_job
+
+    await asyncio.gather(
+        coordinator.async_apply({"running": True}),
+        coordinator.async_apply({"mode": 2}),
+        coordinator.async_apply({"target_humidity": 45}),
+    )
+
+    apply_jobs = [
+        call
+        for call in job.call_args_list
+        if call.args[0] == coordinator._apply_and_refresh
+    ]
+    assert len(apply_jobs) == 1
+    assert dehumidifier_mock.state.running is True
+    assert dehumidifier_mock.state.mode == 2
+    assert dehumidifier_mock.state.target_humidity == 45
+    assert not coordinator.updating
+    await coordinator.async_shutdown()
+
+
+async def test_rejected_cloud_session_starts_reauth(
+    hass: HomeAssistant, dehumidifier_mock
+):
+    """Test that session rejected by Midea cloud is dropped and reauth started"""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="user@example.com",
+        data={
+            CONF_USERNAME: "user@example.com",
+            CONF_PASSWORD: "PasswordPassword",
+            CONF_MOBILE_APP: DEFAULT_APP,
+            CONF_DEVICES: [],
+        },
+    )
+    entry.add_to_hass(hass)
+    hub = Hub(hass, entry)
+    hub.config = dict(entry.data)
+
+    with patch.multiple(MideaClient, connect_to_cloud=Mock()):
+        hub.cloud = await hub._async_get_cloud()
+        current_entry.set(entry)
+        coordinator = ApplianceUpdateCoordinator(
+            hass, hub, dehumidifier_mock, {CONF_DISCOVERY: DISCOVERY_CLOUD}, True
+        )
+        with patch.object(
+            hub,
+            "async_add_appliance_job",
+            AsyncMock(side_effect=CloudAuthenticationError(34, "45", "x@example.com")),
+        ):
+            await coordinator.async_refresh()
+
+        assert not coordinator.last_update_success
+        assert hub.cloud is None
+        assert coordinator._bound_cloud is None
+        # Cached session is gone, next connection logs in again
+        await hub._async_get_cloud()
+        assert MideaClient.connect_to_cloud.call_count == 2
+
+    await hass.async_block_till_done()
+    flows = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+    assert [flow["context"]["source"] for flow in flows] == [SOURCE_REAUTH]
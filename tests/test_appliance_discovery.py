@@ -0,0 +1,153 @@
+"""Test discovery of appliances on local network"""
+# pylint: disable=unused-argument,protected-access
+from ipaddress import IPv4Network
+from itertools import islice
+from unittest.mock import Mock, patch
+
+from homeassistant.const import (
+    CONF_DEVICES,
+    CONF_DISCOVERY,
+    CONF_IP_ADDRESS,
+    CONF_NAME,
+    CONF_TOKEN,
+    CONF_UNIQUE_ID,
+)
+from homeassistant.core import HomeAssistant
+
+from custom_components.midea_dehumidifier_lan.appliance_discovery import (
+    ApplianceDiscoveryHelper,
+)
+from custom_components.midea_dehumidifier_lan.const import (
+    CONF_TOKEN_KEY,
+    DISCOVERY_IGNORE,
+    DISCOVERY_LAN,
+    DISCOVERY_WAIT,
+    UNKNOWN_IP,
+)
+
+
+def _helper(hass: HomeAssistant, devices: list) -> ApplianceDiscoveryHelper:
+    return ApplianceDiscoveryHelper(Mock(hass=hass, config={CONF_DEVICES: devices}))
+
+
+async def test_admit_waiting_device(hass: HomeAssistant, dehumidifier_mock):
+    """Test that known device waiting for discovery is activated"""
+    first = {
+        CONF_UNIQUE_ID: "AC654321",
+        CONF_NAME: "First",
+        CONF_DISCOVERY: DISCOVERY_LAN,
+        CONF_IP_ADDRESS: "192.0.2.2",
+    }
+    waiting = {
+        CONF_UNIQUE_ID: dehumidifier_mock.serial_number,
+        CONF_NAME: "Waiting",
+        CONF_DISCOVERY: DISCOVERY_WAIT,
+        CONF_IP_ADDRESS: UNKNOWN_IP,
+    }
+    helper = _helper(hass, [dict(first), waiting])
+    helper.new_devices.append(dehumidifier_mock)
+
+    with patch(
+        "homeassistant.components.persistent_notification.async_create"
+    ) as notify:
+        assert helper._admit_new()
+        notify.assert_called_once()
+
+    devices = helper.hub.config[CONF_DEVICES]
+    assert len(devices) == 2
+    assert devices[0] == first
+    assert devices[1] is waiting
+    assert waiting[CONF_DISCOVERY] == DISCOVERY_LAN
+    assert waiting[CONF_IP_ADDRESS] == dehumidifier_mock.address
+    assert waiting[CONF_TOKEN] == dehumidifier_mock.token
+    assert waiting[CONF_TOKEN_KEY] == dehumidifier_mock.key
+    assert waiting[CONF_NAME] == "Waiting"
+
+
+async def test_admit_unknown_device(hass: HomeAssistant, dehumidifier_mock):
+    """Test that unknown device is added to existing configuration"""
+    first = {
+        CONF_UNIQUE_ID: "AC654321",
+        CONF_NAME: "First",
+        CONF_DISCOVERY: DISCOVERY_LAN,
+        CONF_IP_ADDRESS: "192.0.2.2",
+    }
+    dehumidifier_mock.mac = None
+    helper = _helper(hass, [dict(first)])
+    helper.new_devices.append(dehumidifier_mock)
+
+    with patch(
+        "homeassistant.components.persistent_notification.async_create"
+    ) as notify:
+        assert helper._admit_new()
+        notify.assert_called_once()
+
+    devices = helper.hub.config[CONF_DEVICES]
+    assert len(devices) == 2
+    assert devices[0] == first
+    assert devices[1][CONF_UNIQUE_ID] == dehumidifier_mock.serial_number
+    assert devices[1][CONF_DISCOVERY] == DISCOVERY_IGNORE
+    assert devices[1][CONF_IP_ADDRESS] == dehumidifier_mock.address
+    assert devices[1][CONF_TOKEN] == dehumidifier_mock.token
+
+
+async def test_admit_nothing_new(hass: HomeAssistant, dehumidifier_mock):
+    """Test that already active device doesn't cause reload"""
+    active = {
+        CONF_UNIQUE_ID: dehumidifier_mock.serial_number,
+        CONF_NAME: "Active",
+        CONF_DISCOVERY: DISCOVERY_LAN,
+        CONF_IP_ADDRESS: dehumidifier_mock.address,
+    }
+    helper = _helper(hass, [dict(active)])
+    helper.new_devices.append(dehumidifier_mock)
+
+    assert not helper._admit_new()
+    assert helper.hub.config[CONF_DEVICES] == [active]
+
+
+async def test_address_generator_starts_over(hass: HomeAssistant):
+    """Test that address batches wrap around after all addresses were produced"""
+    helper = _helper(hass, [])
+    networks = [
+        IPv4Network("192.0.2.0/30"),
+        IPv4Network("192.0.2.9/32"),
+        IPv4Network("198.51.100.0/30"),
+    ]
+
+    batches = list(islice(helper._address_generator(networks, batch_size=3), 4))
+
+    assert batches == [
+        ["192.0.2.1", "192.0.2.2", "198.51.100.1"],
+        ["198.51.100.2"],
+        ["192.0.2.1", "192.0.2.2", "198.51.100.1"],
+        ["198.51.100.2"],
+    ]
+    single = [IPv4Network("192.0.2.9/32")]
+    assert next(helper._address_generator(single), None) is None
+
+
+async def test_unknown_device_batches_notified_separately(hass: HomeAssistant):
+    """Test that each batch of unknown devices keeps its own notification"""
+    helper = _helper(hass, [])
+    batches = [
+        [
+            {CONF_UNIQUE_ID: "SN2", CONF_NAME: "Second", CONF_IP_ADDRESS: "192.0.2.2"},
+            {CONF_UNIQUE_ID: "SN1", CONF_NAME: "First", CONF_IP_ADDRESS: "192.0.2.1"},
+        ],
+        [
+            {CONF_UNIQUE_ID: "SN3", CONF_NAME: "Third", CONF_IP_ADDRESS: "192.0.2.3"},
+            {CONF_UNIQUE_ID: "SN4", CONF_NAME: "Fourth", CONF_IP_ADDRESS: "192.0.2.4"},
+        ],
+    ]
+
+    with patch(
+        "homeassistant.components.persistent_notification.async_create"
+    ) as notify:
+        for batch in batches:
+            helper._unknown_devices_notification(batch)
+
+    assert [call.kwargs["notification_id"] for call in notify.call_args_list] == [
+        "midea_unknown_SN1_SN2",
+        "midea_unknown_SN3_SN4",
+    ]
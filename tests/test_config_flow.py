@@ -9,8 +9,16 @@ from homeassistant.const import (
     CONF_USERNAME,
     CONF_INCLUDE,
     CONF_BROADCAST_ADDRESS,
+    CONF_DEVICES,
+    CONF_DISCOVERY,
+    CONF_ID,
+    CONF_IP_ADDRESS,
+    CONF_NAME,
+    CONF_TYPE,
+    CONF_UNIQUE_ID,
 )
 from homeassistant.core import HomeAssistant
+from midea_beautiful.midea import APPLIANCE_TYPE_DEHUMIDIFIER
 
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 from custom_components.midea_dehumidifier_lan.config_flow import MideaConfigFlow
@@ -18,6 +26,7 @@ from custom_components.midea_dehumidifier_lan.const import (
     CONF_ADVANCED_SETTINGS,
     CONF_MOBILE_APP,
     DEFAULT_APP,
+    DISCOVERY_LAN,
     DOMAIN,
 )
 
@@ -360,3 +369,32 @@ async def test_step_reauth_invalid_password(hass: HomeAssistant, midea_invalid_a
         assert result["step_id"] == "reauth_confirm"
 
     assert len(hass.config_entries.async_entries()) == 1
+
+
+async def test_options_flow_without_hub(hass: HomeAssistant):
+    """Test options flow of entry waiting to retry setup."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="user@example.com",
+        data={
+            CONF_USERNAME: "user@example.com",
+            CONF_PASSWORD: "password",
+            CONF_MOBILE_APP: "MSmartHome",
+            CONF_DEVICES: [
+                {
+                    CONF_ID: "654321",
+                    CONF_UNIQUE_ID: "SN654321",
+                    CONF_TYPE: APPLIANCE_TYPE_DEHUMIDIFIER,
+                    CONF_NAME: "Dehumidifier",
+                    CONF_IP_ADDRESS: "192.0.2.1",
+                    CONF_DISCOVERY: DISCOVERY_LAN,
+                }
+            ],
+        },
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+
+    assert result["type"] == data_entry_flow.RESULT_TYPE_FORM
+    assert result["step_id"] == "appliance"
@@ -1,5 +1,7 @@
 """Test integration configuration flow"""
-# pylint: disable=unused-argument
+# pylint: disable=unused-argument,protected-access
+import asyncio
+from unittest.mock import AsyncMock, Mock, call, patch
 
 from homeassistant.const import (
     CONF_API_VERSION,
@@ -14,18 +16,26 @@ from homeassistant.const import (
     CONF_UNIQUE_ID,
     CONF_USERNAME,
 )
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 from custom_components.midea_dehumidifier_lan.const import (
+    CONF_MOBILE_APP,
     CONF_TOKEN_KEY,
+    DEFAULT_APP,
+    DISCOVERY_CACHE_TTL,
     DISCOVERY_CLOUD,
     DISCOVERY_IGNORE,
     DISCOVERY_LAN,
     DISCOVERY_WAIT,
+    DOMAIN,
 )
 from custom_components.midea_dehumidifier_lan.hub import (
+    Hub,
     _assure_valid_device_configuration,
 )
-from custom_components.midea_dehumidifier_lan.util import RedactedConf
+from custom_components.midea_dehumidifier_lan.util import MideaClient, RedactedConf
 
 
 def test_redact():
@@ -147,3 +157,78 @@ def test_assure_valid_device_configuration():
     valid = _assure_valid_device_configuration(conf, conf[CONF_DEVICES][5])
     assert not valid
     assert conf[CONF_DEVICES][5][CONF_DISCOVERY] == DISCOVERY_IGNORE
+
+
+async def test_refreshes_are_spread_over_interval(hass: HomeAssistant):
+    """Test that appliance refreshes are staggered within the refresh cycle"""
+    hub = Hub(hass, MockConfigEntry(domain=DOMAIN, data={CONF_DEVICES: []}))
+    hub.coordinators = tuple(Mock(async_refresh=AsyncMock()) for _ in range(4))
+
+    with patch(
+        "custom_components.midea_dehumidifier_lan.hub.async_call_later"
+    ) as call_later:
+        hub._schedule_refreshes(dt_util.utcnow())
+
+    assert [call.args[1] for call in call_later.call_args_list] == [0, 15, 30, 45]
+    await call_later.call_args_list[2].args[2](dt_util.utcnow())
+    hub.coordinators[2].async_refresh.assert_awaited_once()
+    hub.coordinators[0].async_refresh.assert_not_awaited()
+
+    hub._stop_refreshes()
+    assert call_later.return_value.call_count == 4
+
+
+async def test_concurrent_cloud_logins_are_shared(hass: HomeAssistant):
+    """Test that concurrent callers share single cloud login"""
+    hub = Hub(hass, MockConfigEntry(domain=DOMAIN, data={CONF_DEVICES: []}))
+    hub.config = {
+        CONF_USERNAME: "user@example.com",
+        CONF_PASSWORD: "PasswordPassword",
+        CONF_MOBILE_APP: DEFAULT_APP,
+    }
+    cloud = Mock()
+    with patch.multiple(MideaClient, connect_to_cloud=Mock(return_value=cloud)):
+        clouds = await asyncio.gather(*(hub._async_get_cloud() for _ in range(3)))
+        assert clouds == [cloud, cloud, cloud]
+        MideaClient.connect_to_cloud.assert_called_once()
+
+
+async def test_scan_results_expire(hass: HomeAssistant, dehumidifier_mock):
+    """Test that scan results are reused only within DISCOVERY_CACHE_TTL"""
+    now = [1000.0]
+    with patch.multiple(
+        MideaClient, find_appliances=Mock(return_value=[dehumidifier_mock])
+    ), patch(
+        "custom_components.midea_dehumidifier_lan.util.monotonic",
+        side_effect=lambda: now[0],
+    ):
+        client = MideaClient(hass)
+        first = await client.async_find_appliances(["192.0.2.255"])
+        now[0] += DISCOVERY_CACHE_TTL - 1
+        assert await MideaClient(hass).async_find_appliances(["192.0.2.255"]) == first
+        assert MideaClient.find_appliances.call_count == 1
+        await client.async_find_appliances(["198.51.100.255"])
+        assert MideaClient.find_appliances.call_count == 2
+
+        now[0] += 1
+        assert await client.async_find_appliances(["192.0.2.255"]) == first
+        assert MideaClient.find_appliances.call_count == 3
+
+
+async def test_unload_stops_coordinators_before_executor(hass: HomeAssistant):
+    """Test that coordinators are shut down before hub's executor"""
+    hub = Hub(hass, MockConfigEntry(domain=DOMAIN, data={CONF_DEVICES: []}))
+    coordinator = Mock(async_shutdown=AsyncMock())
+    hub.coordinators = (coordinator,)
+    executor = hub.executor = Mock()
+    calls = Mock()
+    calls.attach_mock(coordinator.async_shutdown, "coordinator_shutdown")
+    calls.attach_mock(executor.shutdown, "executor_shutdown")
+
+    await hub.async_unload()
+
+    assert calls.mock_calls == [
+        call.coordinator_shutdown(),
+        call.executor_shutdown(wait=False),
+    ]
+    assert hub.executor is None
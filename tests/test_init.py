@@ -0,0 +1,166 @@
+"""Test integration setup and configuration migration"""
+# pylint: disable=unused-argument,protected-access
+from threading import Barrier, Lock
+import time
+from unittest.mock import Mock, patch
+
+from homeassistant.const import (
+    CONF_DEVICES,
+    CONF_DISCOVERY,
+    CONF_ID,
+    CONF_IP_ADDRESS,
+    CONF_NAME,
+    CONF_PASSWORD,
+    CONF_TOKEN,
+    CONF_UNIQUE_ID,
+    CONF_USERNAME,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from custom_components.midea_dehumidifier_lan import (
+    _async_migrate_names,
+    async_migrate_entry,
+)
+from custom_components.midea_dehumidifier_lan.const import (
+    APPLIANCE_REFRESH_CONCURRENCY,
+    CONF_TOKEN_KEY,
+    CURRENT_CONFIG_VERSION,
+    DISCOVERY_LAN,
+    DOMAIN,
+)
+from custom_components.midea_dehumidifier_lan.util import MideaClient
+
+
+async def test_migration_probes_appliances_concurrently(
+    hass: HomeAssistant, dehumidifier_mock, airconditioner_mock
+):
+    """Test that migration polls appliances on local network concurrently"""
+    appliances = {
+        mock.address: mock for mock in (dehumidifier_mock, airconditioner_mock)
+    }
+    # Each probe waits for the other one, sequential polling would time out
+    barrier = Barrier(len(appliances), timeout=5)
+
+    def _appliance_state(address, *args):
+        barrier.wait()
+        return appliances[address]
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=1,
+        data={
+            CONF_USERNAME: "user@example.com",
+            CONF_PASSWORD: "PasswordPassword",
+            CONF_DEVICES: [
+                {
+                    CONF_ID: mock.appliance_id,
+                    CONF_IP_ADDRESS: mock.address,
+                    CONF_NAME: mock.name,
+                    CONF_TOKEN: mock.token,
+                    CONF_TOKEN_KEY: mock.key,
+                }
+                for mock in appliances.values()
+            ],
+        },
+    )
+    entry.add_to_hass(hass)
+    with patch.multiple(
+        MideaClient,
+        connect_to_cloud=Mock(),
+        appliance_state=Mock(side_effect=_appliance_state),
+    ):
+        assert await async_migrate_entry(hass, entry)
+        MideaClient.connect_to_cloud.assert_not_called()
+
+    assert entry.version == CURRENT_CONFIG_VERSION
+    devices = entry.data[CONF_DEVICES]
+    assert [device[CONF_UNIQUE_ID] for device in devices] == ["SN654321", "AC654321"]
+    assert all(device[CONF_DISCOVERY] == DISCOVERY_LAN for device in devices)
+
+
+async def test_unique_ids_renamed_to_serial_numbers(hass: HomeAssistant):
+    """Test that unique ids ending in appliance id are renamed"""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=CURRENT_CONFIG_VERSION,
+        data={CONF_DEVICES: [{CONF_ID: "654321", CONF_UNIQUE_ID: "SN654321"}]},
+    )
+    entry.add_to_hass(hass)
+    other_entry = MockConfigEntry(domain=DOMAIN, version=CURRENT_CONFIG_VERSION)
+    other_entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    humidifier = registry.async_get_or_create(
+        "humidifier", DOMAIN, "midea_dehumidifier_654321", config_entry=entry
+    )
+    sensor = registry.async_get_or_create(
+        "sensor", DOMAIN, "midea_dehumidifier_humidity_654321", config_entry=entry
+    )
+    migrated = registry.async_get_or_create(
+        "binary_sensor", DOMAIN, "midea_dehumidifier_tank_SN654321", config_entry=entry
+    )
+    foreign = registry.async_get_or_create(
+        "switch", DOMAIN, "midea_dehumidifier_ion_654321", config_entry=other_entry
+    )
+
+    await _async_migrate_names(hass, entry)
+
+    assert (
+        registry.async_get(humidifier.entity_id).unique_id
+        == "midea_dehumidifier_SN654321"
+    )
+    assert (
+        registry.async_get(sensor.entity_id).unique_id
+        == "midea_dehumidifier_humidity_SN654321"
+    )
+    assert registry.async_get(migrated.entity_id).unique_id == migrated.unique_id
+    assert registry.async_get(foreign.entity_id).unique_id == foreign.unique_id
+
+
+async def test_migration_limits_concurrent_probes(hass: HomeAssistant):
+    """Test that migration doesn't poll too many appliances at once"""
+    lock = Lock()
+    active = [0]
+    peak = [0]
+
+    def _appliance_state(address, *args):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return Mock(serial_number=f"SN{address}")
+
+    addresses = [f"192.0.2.{i}" for i in range(1, 2 * APPLIANCE_REFRESH_CONCURRENCY)]
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=1,
+        data={
+            CONF_USERNAME: "user@example.com",
+            CONF_PASSWORD: "PasswordPassword",
+            CONF_DEVICES: [
+                {
+                    CONF_ID: str(index),
+                    CONF_IP_ADDRESS: address,
+                    CONF_NAME: f"Appliance {index}",
+                    CONF_TOKEN: "TOKEN",
+                    CONF_TOKEN_KEY: "KEY",
+                }
+                for index, address in enumerate(addresses)
+            ],
+        },
+    )
+    entry.add_to_hass(hass)
+    with patch.multiple(
+        MideaClient,
+        connect_to_cloud=Mock(),
+        appliance_state=Mock(side_effect=_appliance_state),
+    ):
+        assert await async_migrate_entry(hass, entry)
+
+    assert 1 < peak[0] <= APPLIANCE_REFRESH_CONCURRENCY
+    assert [device[CONF_UNIQUE_ID] for device in entry.data[CONF_DEVICES]] == [
+        f"SN{address}" for address in addresses
+    ]